@@ -1,8 +1,72 @@
 import os
+import re
+import sys
+import gzip
 import json
+import math
+import sqlite3
+import calendar
+import codecs
+import hashlib
+import asyncio
+import threading
+import zipfile
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
+from array import array
+from bisect import bisect_right
+from bs4 import BeautifulSoup, SoupStrainer
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from html.parser import HTMLParser
+from requests.adapters import HTTPAdapter
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
 
 # Base URL of the website
 BASE_URL = "https://ncics.org/ibtracs/index.php"
@@ -17,16 +81,276 @@ BASIN_ABBREVIATIONS = {
     "Southern Pacific": "sp"
 }
 
-def fetch_year_page(year):
-    url = f"{BASE_URL}?name=YearBasin-{year}"
-    response = requests.get(url)
+# HTML parser backend: "selectolax", or a BeautifulSoup parser name ("lxml", "html.parser").
+# Defaults to the fastest one installed.
+if SelectolaxParser is not None:
+    PARSER_BACKEND = "selectolax"
+elif lxml is not None:
+    PARSER_BACKEND = "lxml"
+else:
+    PARSER_BACKEND = "html.parser"
+
+# Only the tags the extractors look at are kept in the BeautifulSoup tree.
+YEAR_PAGE_STRAINER = SoupStrainer('table', attrs={'class': 'ishade'})
+STORM_PAGE_STRAINER = SoupStrainer(['h1', 'table'])
+
+# When enabled, storm pages are read in chunks of STREAM_CHUNK_SIZE bytes and the download
+# stops as soon as the track table has been parsed. With PAGE_ARCHIVE_FOLDER set the rest of the
+# page is still read, so the archive gets the whole page.
+STREAM_STORM_PAGES = False
+STREAM_CHUNK_SIZE = 16384
+
+# Storage format of the basin-year cache, also used as the file extension: "json", compact
+# compressed "json.gz" / "json.zst" (needs zstandard), or the columnar "npz" (needs numpy)
+# and "parquet" (needs pyarrow). load_cache falls back to any other format already on disk.
+# The columnar formats save disk space, but load_cache is slower on them than on JSON because it
+# rebuilds a dict per point; load_storms reads them straight into Track columns instead.
+CACHE_FORMAT = "json"
+CACHE_FORMATS = ("json", "json.gz", "json.zst", "npz", "parquet")
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+# Besides the cache, every season is also written as "{abbr}_{year}_v2.json" for the visualizer:
+# schema v2 has numeric speed/pressure with flags for "< 35" / "> 1008", epoch-ms timestamps and
+# paths sorted by time, so script.js doesn't parse anything. It costs a second encode of every season,
+# so it is off by default; set to True to write it.
+WRITE_SCHEMA_V2 = False
+
+# JSON caches are written storm by storm to "<cache file>.partial" while the season is scraped and
+# renamed into place at the end. After a crash the next run keeps the storms already written.
+# save_data_as_json still reads the finished season back into dicts to return it; pass lazy=True to get
+# StormHandles instead if peak memory matters. scrape_typhoon_data always returns dicts.
+STREAM_CACHE_WRITES = True
+
+# When set (e.g. "data/storms.sqlite"), every save_cache also writes the basin-year into this
+# SQLite store, which can be queried by time window and bounding box without loading whole files.
+SQLITE_DB_PATH = None
+GRID_CELL_DEGREES = 5
+
+# Size budget for the season files in a cache folder (None for no limit); least recently used
+# seasons are evicted first. Seasons that may still change expire OPEN_SEASON_TTL_HOURS after
+# they were written and are refreshed; closed seasons never expire.
+CACHE_MAX_BYTES = None
+OPEN_SEASON_TTL_HOURS = 6
+CACHE_MANIFEST_FILE = "cache_manifest.json"
+
+# A storm whose latest track point is this recent is marked "active" and is re-scraped by refresh_season.
+ACTIVE_STORM_HOURS = 48
+
+# Folder for raw storm/year pages kept with their ETag/Last-Modified validators, e.g. "data/pages".
+# When set, pages are re-requested conditionally and a 304 reuses the stored copy.
+PAGE_CACHE_FOLDER = None
+
+# Folder of the raw page archive (e.g. "data/raw"). When set, every fully downloaded page is kept
+# as a gzip blob named by its content hash, plus a per-URL pointer, so `reprocess` can rebuild
+# the basin-year caches without touching the network. IBtrACS seasons start in FIRST_SEASON_YEAR.
+PAGE_ARCHIVE_FOLDER = None
+FIRST_SEASON_YEAR = 1842
+
+# Maximum number of requests in flight against a single host, however many workers are running.
+PER_HOST_LIMIT = 4
+
+# Connection pool sizing for the shared session: number of host pools kept alive and
+# number of keep-alive connections per host (should be at least the worker count).
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+# "revalidated" counts 304 responses served from PAGE_CACHE_FOLDER, "stored" counts pages written to it.
+PAGE_CACHE_STATS = Counter()
+# "hits" / "misses" for load_cache, "expired" for open seasons past their TTL, "evictions" and "evicted_bytes".
+CACHE_STATS = Counter()
+_counters_lock = threading.Lock()
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+_default_session = None
+_default_session_lock = threading.Lock()
+
+def create_session(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def get_session():
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = create_session()
+        return _default_session
+
+def connection_stats(session=None):
+    session = session or get_session()
+    stats = {"connections": 0, "requests": 0}
+    for adapter in {id(adapter): adapter for adapter in session.adapters.values()}.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            stats["connections"] += pool.num_connections
+            stats["requests"] += pool.num_requests
+    stats["reused"] = stats["requests"] - stats["connections"]
+    return stats
+
+def host_slot(url, per_host_limit=PER_HOST_LIMIT):
+    key = (urlparse(url).netloc, per_host_limit)
+    with _host_slots_lock:
+        if key not in _host_slots:
+            _host_slots[key] = threading.BoundedSemaphore(per_host_limit)
+        return _host_slots[key]
+
+def count_request(url, request_counts=None):
+    # Each scrape run passes its own Counter down, so concurrent runs in one process don't mix their counts.
+    if request_counts is not None:
+        with _counters_lock:
+            request_counts[url] += 1
+
+class CachedPage:
+    # Stands in for a requests.Response when a 304 lets us reuse the stored page.
+    status_code = 200
+
+    def __init__(self, url, content, meta):
+        self.url = url
+        self.content = content
+        self.meta = meta
+        self.encoding = meta.get("encoding")
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+def page_cache_paths(url, folder_path):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(folder_path, f"{key}.html"), os.path.join(folder_path, f"{key}.json")
+
+def load_cached_page(url, folder_path=None):
+    folder_path = folder_path or PAGE_CACHE_FOLDER
+    if not folder_path:
+        return None
+    page_file, meta_file = page_cache_paths(url, folder_path)
+    if not (os.path.exists(page_file) and os.path.exists(meta_file)):
+        return None
+    try:
+        with open(meta_file, "r") as file:
+            meta = json.load(file)
+        with open(page_file, "rb") as file:
+            content = file.read()
+    except (OSError, json.JSONDecodeError):
+        return None
+    return CachedPage(url, content, meta)
+
+def save_cached_page(url, response, folder_path=None):
+    folder_path = folder_path or PAGE_CACHE_FOLDER
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not folder_path or not (etag or last_modified):
+        return
+    if not os.path.exists(folder_path):
+        os.makedirs(folder_path, exist_ok=True)
+    page_file, meta_file = page_cache_paths(url, folder_path)
+    with atomic_write(page_file, "wb") as file:
+        file.write(response.content)
+    with atomic_write(meta_file) as file:
+        json.dump({"url": url, "etag": etag, "last_modified": last_modified, "encoding": response.encoding}, file)
+    with _counters_lock:
+        PAGE_CACHE_STATS["stored"] += 1
+
+def revalidation_headers(cached_page):
+    headers = {}
+    if cached_page is not None:
+        if cached_page.meta.get("etag"):
+            headers["If-None-Match"] = cached_page.meta["etag"]
+        if cached_page.meta.get("last_modified"):
+            headers["If-Modified-Since"] = cached_page.meta["last_modified"]
+    return headers
+
+def archive_paths(url, folder_path):
+    url_key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(folder_path, "urls", url_key[:2], f"{url_key}.json")
+
+def blob_path(content_key, folder_path):
+    return os.path.join(folder_path, "blobs", content_key[:2], f"{content_key}.html.gz")
+
+def archive_page(url, content, encoding, folder_path=None):
+    # Identical pages (same content hash) share one blob; the per-URL pointer always names the latest one.
+    folder_path = folder_path or PAGE_ARCHIVE_FOLDER
+    if not folder_path:
+        return
+    content_key = hashlib.sha256(content).hexdigest()
+    blob_file = blob_path(content_key, folder_path)
+    if not os.path.exists(blob_file):
+        os.makedirs(os.path.dirname(blob_file), exist_ok=True)
+        with atomic_write(blob_file, "wb") as file:
+            file.write(gzip.compress(content, mtime=0))
+    pointer_file = archive_paths(url, folder_path)
+    os.makedirs(os.path.dirname(pointer_file), exist_ok=True)
+    with atomic_write(pointer_file) as file:
+        json.dump({"url": url, "blob": content_key, "encoding": encoding}, file)
+
+def load_archived_page(url, folder_path=None):
+    folder_path = folder_path or PAGE_ARCHIVE_FOLDER
+    pointer_file = archive_paths(url, folder_path)
+    if not os.path.exists(pointer_file):
+        return None
+    try:
+        with open(pointer_file, "r") as file:
+            pointer = json.load(file)
+        with open(blob_path(pointer["blob"], folder_path), "rb") as file:
+            content = gzip.decompress(file.read())
+    except (OSError, EOFError, KeyError, json.JSONDecodeError):
+        return None
+    return CachedPage(url, content, {"encoding": pointer.get("encoding")})
+
+def fetch_page(url, per_host_limit=PER_HOST_LIMIT, session=None, request_counts=None):
+    count_request(url, request_counts)
+    cached_page = load_cached_page(url)
+    with host_slot(url, per_host_limit):
+        response = (session or get_session()).get(url, headers=revalidation_headers(cached_page))
+    if cached_page is not None and response.status_code == 304:
+        with _counters_lock:
+            PAGE_CACHE_STATS["revalidated"] += 1
+        response = cached_page
+    elif response.status_code == 200:
+        save_cached_page(url, response)
+    if response.status_code == 200:
+        archive_page(url, response.content, response.encoding)
+    return response
+
+def year_page_url(year):
+    return f"{BASE_URL}?name=YearBasin-{year}"
+
+def fetch_year_page(year, per_host_limit=PER_HOST_LIMIT, session=None, request_counts=None):
+    url = year_page_url(year)
+    response = fetch_page(url, per_host_limit, session, request_counts)
     if response.status_code != 200:
         print(f"Failed to retrieve page for year {year}: {response.status_code}")
         return None
     return response.text
 
-def extract_links_from_second_table(html):
-    soup = BeautifulSoup(html, 'html.parser')
+async def fetch_page_async(session, url, semaphore, request_counts=None):
+    count_request(url, request_counts)
+    async with semaphore:
+        async with session.get(url) as response:
+            if response.status != 200:
+                return response.status, None
+            content = await response.read()
+            if PAGE_ARCHIVE_FOLDER:
+                # Hashing, compressing and writing the page would otherwise block the event loop.
+                await asyncio.get_running_loop().run_in_executor(None, archive_page, url, content, response.get_encoding())
+            return response.status, await response.text()
+
+async def fetch_year_page_async(session, year, semaphore, request_counts=None):
+    url = year_page_url(year)
+    status, html = await fetch_page_async(session, url, semaphore, request_counts)
+    if status != 200:
+        print(f"Failed to retrieve page for year {year}: {status}")
+        return None
+    return html
+
+def extract_links_from_second_table(html, parser=None):
+    parser = parser or PARSER_BACKEND
+    if parser == "selectolax":
+        return extract_links_from_second_table_selectolax(SelectolaxParser(html))
+    soup = BeautifulSoup(html, parser, parse_only=YEAR_PAGE_STRAINER)
     tables = soup.find_all('table', {'class': 'ishade', 'summary': 'Layout table.'})
     if len(tables) < 2:
         print("Less than two tables found on the page.")
@@ -44,12 +368,25 @@ def extract_links_from_second_table(html):
                 basin_links[basins[index]].append(f"{BASE_URL_ALT}{link['href']}")
     return basin_links
 
-def scrape_fourth_table(link):
-    response = requests.get(link)
-    if response.status_code != 200:
-        print(f"Failed to retrieve page: {response.status_code}")
+def extract_links_from_second_table_selectolax(tree):
+    tables = [table for table in tree.css('table.ishade') if table.attributes.get('summary') == 'Layout table.']
+    if len(tables) < 2:
+        print("Less than two tables found on the page.")
         return None
-    soup = BeautifulSoup(response.text, 'html.parser')
+    table = tables[1]
+    headers = table.css_first('tr').css('td')
+    basins = [header.text().strip() for header in headers]
+    basin_links = {basin: [] for basin in basins}
+    rows = table.css('tr')[1:]
+    for row in rows:
+        cells = row.css('td')
+        for index, cell in enumerate(cells):
+            links = cell.css('a[href]')
+            for link in links:
+                basin_links[basins[index]].append(f"{BASE_URL_ALT}{link.attributes['href']}")
+    return basin_links
+
+def extract_fourth_table(soup):
     tables = soup.find_all('table')
     if len(tables) < 4:
         print("Less than four tables found on the page.")
@@ -63,6 +400,187 @@ def scrape_fourth_table(link):
         table_data.append(row_data)
     return table_data
 
+def extract_typhoon_name(soup):
+    name_element = soup.find('h1')
+    if name_element:
+        return name_element.get_text(strip=True)
+    return None
+
+def extract_fourth_table_selectolax(tree):
+    tables = tree.css('table')
+    if len(tables) < 4:
+        print("Less than four tables found on the page.")
+        return None
+    table = tables[3]
+    rows = table.css('tr')
+    table_data = []
+    for row in rows[2:]:
+        cells = row.css('td, th')
+        row_data = [cell.text().strip() for cell in cells]
+        table_data.append(row_data)
+    return table_data
+
+def extract_typhoon_name_selectolax(tree):
+    name_element = tree.css_first('h1')
+    if name_element:
+        return name_element.text(strip=True)
+    return None
+
+def parse_storm_page(html, parser=None):
+    parser = parser or PARSER_BACKEND
+    if parser == "selectolax":
+        tree = SelectolaxParser(html)
+        return extract_typhoon_name_selectolax(tree), extract_fourth_table_selectolax(tree)
+    soup = BeautifulSoup(html, parser, parse_only=STORM_PAGE_STRAINER)
+    return extract_typhoon_name(soup), extract_fourth_table(soup)
+
+def scrape_storm_page(link, per_host_limit=PER_HOST_LIMIT, session=None, request_counts=None):
+    if STREAM_STORM_PAGES:
+        return scrape_storm_page_streaming(link, per_host_limit, session, request_counts=request_counts)
+    response = fetch_page(link, per_host_limit, session, request_counts)
+    if response.status_code != 200:
+        print(f"Failed to retrieve page: {response.status_code}")
+        return None, None
+    return parse_storm_page(response.text)
+
+def scrape_fourth_table(link, session=None):
+    response = fetch_page(link, session=session)
+    if response.status_code != 200:
+        print(f"Failed to retrieve page: {response.status_code}")
+        return None
+    return parse_storm_page(response.text)[1]
+
+class FourthTableStreamParser(HTMLParser):
+    # Incremental counterpart of parse_storm_page: collects the h1 text and the rows of the
+    # fourth <table> as they are fed, and sets done once that table is closed.
+    def __init__(self):
+        super().__init__()
+        self.status = None
+        self.name = None
+        self.rows = []
+        self.tables_seen = 0
+        self.done = False
+        self._name_parts = None
+        self._name_text = ""
+        self._depth = 0
+        self._row_count = 0
+        self._row = None
+        self._cell = None
+
+    def pop_rows(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_name_text()
+        if tag == 'h1' and self.name is None and self._name_parts is None:
+            self._name_parts = []
+        elif tag == 'table':
+            self.tables_seen += 1
+            if self._depth or self.tables_seen == 4:
+                self._depth += 1
+        elif self._depth and tag == 'tr':
+            self._end_row()
+            self._row_count += 1
+            self._row = []
+        elif self._depth and tag in ('td', 'th') and self._row is not None:
+            self._end_cell()
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        self._flush_name_text()
+        if tag == 'h1' and self._name_parts is not None:
+            self.name = "".join(self._name_parts)
+            self._name_parts = None
+        elif self._depth and tag == 'table':
+            self._depth -= 1
+            if not self._depth:
+                self._end_row()
+                self.done = True
+        elif self._depth and tag == 'tr':
+            self._end_row()
+        elif self._depth and tag in ('td', 'th'):
+            self._end_cell()
+
+    def close(self):
+        super().close()
+        self._end_row()
+
+    def handle_data(self, data):
+        if self._name_parts is not None:
+            self._name_text += data
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def _flush_name_text(self):
+        if self._name_parts is not None and self._name_text.strip():
+            self._name_parts.append(self._name_text.strip())
+        self._name_text = ""
+
+    def _end_cell(self):
+        if self._cell is not None:
+            self._row.append("".join(self._cell).strip())
+            self._cell = None
+
+    def _end_row(self):
+        self._end_cell()
+        if self._row is not None:
+            if self._row_count > 2:
+                self.rows.append(self._row)
+            self._row = None
+
+def iter_storm_page(link, stream_parser, per_host_limit=PER_HOST_LIMIT, session=None, chunk_size=STREAM_CHUNK_SIZE, request_counts=None):
+    count_request(link, request_counts)
+    # A streamed page is usually not read to the end, so it can be revalidated from the page cache but not stored in it.
+    cached_page = load_cached_page(link)
+    with host_slot(link, per_host_limit):
+        response = (session or get_session()).get(link, stream=True, headers=revalidation_headers(cached_page))
+        # Closing a partly read response drops the connection instead of draining the rest of the page.
+        with closing(response):
+            if cached_page is not None and response.status_code == 304:
+                with _counters_lock:
+                    PAGE_CACHE_STATS["revalidated"] += 1
+                stream_parser.status = cached_page.status_code
+                stream_parser.feed(cached_page.text)
+                stream_parser.close()
+                yield from stream_parser.pop_rows()
+                archive_page(link, cached_page.content, cached_page.encoding)
+                return
+            stream_parser.status = response.status_code
+            if response.status_code != 200:
+                print(f"Failed to retrieve page: {response.status_code}")
+                return
+            decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+            # Archived pages have to be complete, so archiving keeps reading after the table is parsed.
+            archived_chunks = [] if PAGE_ARCHIVE_FOLDER else None
+            for chunk in response.iter_content(chunk_size):
+                if archived_chunks is not None:
+                    archived_chunks.append(chunk)
+                if not stream_parser.done:
+                    stream_parser.feed(decoder.decode(chunk))
+                    yield from stream_parser.pop_rows()
+                if stream_parser.done and archived_chunks is None:
+                    return
+            if not stream_parser.done:
+                stream_parser.feed(decoder.decode(b'', final=True))
+                stream_parser.close()
+                yield from stream_parser.pop_rows()
+            if archived_chunks is not None:
+                archive_page(link, b"".join(archived_chunks), response.encoding)
+
+def stream_fourth_table(link, per_host_limit=PER_HOST_LIMIT, session=None, chunk_size=STREAM_CHUNK_SIZE):
+    return iter_storm_page(link, FourthTableStreamParser(), per_host_limit, session, chunk_size)
+
+def scrape_storm_page_streaming(link, per_host_limit=PER_HOST_LIMIT, session=None, chunk_size=STREAM_CHUNK_SIZE, request_counts=None):
+    stream_parser = FourthTableStreamParser()
+    table_data = list(iter_storm_page(link, stream_parser, per_host_limit, session, chunk_size, request_counts))
+    if stream_parser.status != 200:
+        return None, None
+    if stream_parser.tables_seen < 4:
+        print("Less than four tables found on the page.")
+        return stream_parser.name, None
+    return stream_parser.name, table_data
+
 def add_missing_dates_and_empty_cells(data):
     last_date = None
     last_row = None
@@ -82,123 +600,1933 @@ def add_missing_dates_and_empty_cells(data):
         last_row = row
     return data
 
-def get_typhoon_name_from_link(link):
-    response = requests.get(link)
+def get_typhoon_name_from_link(link, session=None):
+    response = fetch_page(link, session=session)
     if response.status_code == 200:
-        soup = BeautifulSoup(response.content, 'html.parser')
-        name_element = soup.find('h1')
-        if name_element:
-            return name_element.get_text(strip=True)
+        return parse_storm_page(response.content)[0]
     return None
 
-def save_cache(data, year, basin_name, folder_path="data"):
+def storm_id_from_link(link):
+    # Storm links look like index.php?name=v04r01-2023142N07152; the IBTrACS serial number is stable across versions.
+    name = parse_qs(urlparse(link).query).get("name")
+    if not name:
+        return link
+    return name[0].split("-")[-1]
+
+def is_storm_active(last_time, now=None):
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    return now - last_time <= timedelta(hours=ACTIVE_STORM_HOURS)
+
+@contextmanager
+def atomic_write(path, mode="w"):
+    # Readers see either the old file or the complete new one, never a partial write.
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, mode) as file:
+            yield file
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def lock_file_path(folder_path, name):
+    return os.path.join(folder_path, ".locks", f"{name}.lock")
+
+def acquire_file_lock(path):
+    # flock is held per open file, so it serializes threads of this process as well as other processes.
+    # Without fcntl (Windows) only the atomic writes protect the cache.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lock_fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is not None:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+    return lock_fd
+
+def release_file_lock(lock_fd):
+    if fcntl is not None:
+        fcntl.flock(lock_fd, fcntl.LOCK_UN)
+    os.close(lock_fd)
+
+@contextmanager
+def file_lock(path):
+    lock_fd = acquire_file_lock(path)
+    try:
+        yield
+    finally:
+        release_file_lock(lock_fd)
+
+def cache_file_path(year, basin_name, folder_path="data", cache_format=None):
+    basin_abbr = BASIN_ABBREVIATIONS.get(basin_name, "unknown")
+    return os.path.join(folder_path, f"{basin_abbr}_{year}_data.{cache_format or CACHE_FORMAT}")
+
+def loads_json(content):
+    return orjson.loads(content) if orjson else json.loads(content)
+
+def dumps_storm_json(typhoon_data):
+    # One storm as it appears inside the indent=4 season list. This stays on the json module:
+    # orjson writes non-ASCII as UTF-8 and formats some floats differently, so it can't match json.dump.
+    return json.dumps(typhoon_data, indent=4).replace("\n", "\n    ").encode("utf-8")
+
+def save_json_cache(data, cache_file):
+    # Written storm by storm so the byte span of each storm is known; the output is the same as
+    # json.dump(data, file, indent=4). The spans let load_storm_headers decode a single storm.
+    spans = []
+    with atomic_write(cache_file, "wb") as file:
+        if not data:
+            file.write(json.dumps(data, indent=4).encode("utf-8"))
+            return spans
+        offset = file.write(b"[\n    ")
+        for position, storm in enumerate(data):
+            if position:
+                offset += file.write(b",\n    ")
+            encoded = dumps_storm_json(storm)
+            spans.append([offset, offset + len(encoded)])
+            offset += file.write(encoded)
+        file.write(b"\n]")
+    return spans
+
+def load_json_cache(cache_file):
+    with open(cache_file, "rb") as file:
+        return loads_json(file.read())
+
+def compact_json_bytes(data):
+    # Compressed caches are machine-only, so they skip the indentation.
+    if orjson:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def save_gzip_cache(data, cache_file):
+    with atomic_write(cache_file, "wb") as file:
+        # mtime=0 keeps the output identical for identical data.
+        with gzip.GzipFile(fileobj=file, mode="wb", compresslevel=GZIP_LEVEL, mtime=0) as gzip_file:
+            gzip_file.write(compact_json_bytes(data))
+
+def load_gzip_cache(cache_file):
+    with open(cache_file, "rb") as file:
+        return loads_json(gzip.decompress(file.read()))
+
+def save_zstd_cache(data, cache_file):
+    with atomic_write(cache_file, "wb") as file:
+        file.write(zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(compact_json_bytes(data)))
+
+def load_zstd_cache(cache_file):
+    with open(cache_file, "rb") as file:
+        return loads_json(zstandard.ZstdDecompressor().decompress(file.read()))
+
+def encode_column(values):
+    # Picks a typed array for one path key across all points: int/float/bool arrays, dictionary-encoded
+    # strings, or a JSON blob for anything mixed. None values are recorded in a separate null mask.
+    non_null = [value for value in values if value is not None]
+    nulls = np.array([value is None for value in values], dtype=bool)
+    if all(type(value) is int for value in non_null):
+        kind, arrays = "int", {"values": np.array([value or 0 for value in values], dtype=np.int64)}
+    elif all(type(value) is float for value in non_null):
+        kind, arrays = "float", {"values": np.array([value if value is not None else 0.0 for value in values], dtype=np.float64)}
+    elif all(type(value) is bool for value in non_null):
+        kind, arrays = "bool", {"values": np.array([bool(value) for value in values], dtype=bool)}
+    elif all(type(value) is str for value in non_null):
+        categories, codes = np.unique(np.array([value or "" for value in values], dtype=str), return_inverse=True)
+        kind, arrays = "str", {"values": codes.astype(np.int32), "categories": categories}
+    else:
+        kind, arrays = "json", {"values": np.array(json.dumps(values))}
+    if nulls.any():
+        arrays["nulls"] = nulls
+    return kind, arrays
+
+def decode_column(kind, arrays):
+    if kind == "json":
+        return json.loads(arrays["values"].item())
+    if kind == "str":
+        values = arrays["categories"][arrays["values"]].tolist()
+    else:
+        values = arrays["values"].tolist()
+    if "nulls" in arrays:
+        for index in np.flatnonzero(arrays["nulls"]).tolist():
+            values[index] = None
+    return values
+
+def save_npz_cache(data, cache_file):
+    points = [point for typhoon_data in data for point in typhoon_data["path"]]
+    keys = list(dict.fromkeys(key for point in points for key in point))
+    # Storm-level fields are small and stay JSON; "path" is kept as a placeholder so key order survives.
+    header = {"storms": [{**typhoon_data, "path": None} for typhoon_data in data], "columns": []}
+    arrays = {"offsets": np.cumsum([0] + [len(typhoon_data["path"]) for typhoon_data in data], dtype=np.int64)}
+    for index, key in enumerate(keys):
+        kind, column_arrays = encode_column([point.get(key) for point in points])
+        missing = np.array([key not in point for point in points], dtype=bool)
+        if missing.any():
+            column_arrays["missing"] = missing
+        header["columns"].append({"key": key, "kind": kind})
+        for name, column_array in column_arrays.items():
+            arrays[f"c{index}_{name}"] = column_array
+    arrays["header"] = np.array(json.dumps(header))
+    with atomic_write(cache_file, "wb") as file:
+        np.savez_compressed(file, **arrays)
+
+def load_npz_cache(cache_file):
+    with np.load(cache_file, allow_pickle=False) as npz:
+        header = json.loads(npz["header"].item())
+        offsets = npz["offsets"].tolist()
+        columns = []
+        for index, column in enumerate(header["columns"]):
+            prefix = f"c{index}_"
+            arrays = {name[len(prefix):]: npz[name] for name in npz.files if name.startswith(prefix)}
+            missing = arrays.pop("missing").tolist() if "missing" in arrays else None
+            columns.append((column["key"], decode_column(column["kind"], arrays), missing))
+    keys = [key for key, _, _ in columns]
+    if all(missing is None for _, _, missing in columns):
+        points = [dict(zip(keys, row)) for row in zip(*(values for _, values, _ in columns))]
+    else:
+        points = []
+        for position in range(offsets[-1] if offsets else 0):
+            point = {}
+            for key, values, missing in columns:
+                if missing is None or not missing[position]:
+                    point[key] = values[position]
+            points.append(point)
+    data = header["storms"]
+    for index, typhoon_data in enumerate(data):
+        typhoon_data["path"] = points[offsets[index]:offsets[index + 1]]
+    return data
+
+def save_parquet_cache(data, cache_file):
+    with atomic_write(cache_file, "wb") as file:
+        pyarrow.parquet.write_table(pyarrow.Table.from_pylist(data), file)
+
+def load_parquet_cache(cache_file):
+    return pyarrow.parquet.read_table(cache_file).to_pylist()
+
+CACHE_WRITERS = {"json": save_json_cache, "json.gz": save_gzip_cache, "json.zst": save_zstd_cache,
+                 "npz": save_npz_cache, "parquet": save_parquet_cache}
+CACHE_READERS = {"json": load_json_cache, "json.gz": load_gzip_cache, "json.zst": load_zstd_cache,
+                 "npz": load_npz_cache, "parquet": load_parquet_cache}
+
+CACHE_READ_ERRORS = (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) + ((zstandard.ZstdError,) if zstandard else ())
+
+def cache_format_available(cache_format):
+    if cache_format == "json.zst":
+        return zstandard is not None
+    if cache_format == "npz":
+        return np is not None
+    if cache_format == "parquet":
+        return pyarrow is not None
+    return cache_format in CACHE_WRITERS
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS storms (
+    storm_key INTEGER PRIMARY KEY,
+    basin TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    id TEXT,
+    name TEXT,
+    start_time INTEGER,
+    first_ts INTEGER,
+    last_ts INTEGER,
+    min_lat REAL,
+    max_lat REAL,
+    min_lon REAL,
+    max_lon REAL,
+    UNIQUE (basin, year, position)
+);
+CREATE TABLE IF NOT EXISTS track_points (
+    storm_key INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    time TEXT,
+    ts INTEGER,
+    lat REAL,
+    long REAL,
+    norm_long REAL,
+    speed TEXT,
+    pressure TEXT,
+    class INTEGER,
+    cell INTEGER,
+    PRIMARY KEY (storm_key, seq)
+);
+CREATE TABLE IF NOT EXISTS store_info (
+    key TEXT PRIMARY KEY,
+    value INTEGER
+);
+CREATE INDEX IF NOT EXISTS storms_basin_year ON storms (basin, year);
+CREATE INDEX IF NOT EXISTS storms_first_ts ON storms (first_ts);
+CREATE INDEX IF NOT EXISTS storms_id ON storms (id);
+CREATE INDEX IF NOT EXISTS track_points_ts ON track_points (ts);
+CREATE INDEX IF NOT EXISTS track_points_cell ON track_points (cell);
+"""
+
+def connect_sqlite(db_path=None):
+    db_path = db_path or SQLITE_DB_PATH
+    folder = os.path.dirname(db_path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder, exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SQLITE_SCHEMA)
+    return connection
+
+def to_epoch(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return calendar.timegm(value.utctimetuple())
+
+def normalize_longitude(long):
+    return (long + 180.0) % 360.0 - 180.0
+
+def grid_cell(lat, long):
+    # Cells are GRID_CELL_DEGREES squares numbered row-major from (-90, -180).
+    columns = int(360 // GRID_CELL_DEGREES)
+    row = min(int((lat + 90.0) // GRID_CELL_DEGREES), int(180 // GRID_CELL_DEGREES) - 1)
+    column = min(int((normalize_longitude(long) + 180.0) // GRID_CELL_DEGREES), columns - 1)
+    return row * columns + column
+
+def save_to_sqlite(data, year, basin_name, db_path=None):
     basin_abbr = BASIN_ABBREVIATIONS.get(basin_name, "unknown")
+    with closing(connect_sqlite(db_path)) as connection, connection:
+        connection.execute("DELETE FROM track_points WHERE storm_key IN (SELECT storm_key FROM storms WHERE basin = ? AND year = ?)", (basin_abbr, int(year)))
+        connection.execute("DELETE FROM storms WHERE basin = ? AND year = ?", (basin_abbr, int(year)))
+        max_duration = 0
+        for position, typhoon_data in enumerate(data):
+            points = []
+            for seq, point in enumerate(typhoon_data["path"]):
+                time = point_time(point)
+                ts = to_epoch(time) if time else None
+                lat, long = point.get("lat"), point.get("long")
+                located = lat is not None and long is not None
+                points.append((seq, point.get("time"), ts, lat, long, normalize_longitude(long) if located else None,
+                               point.get("speed"), point.get("pressure"), point.get("class"), grid_cell(lat, long) if located else None))
+            timestamps = [point[2] for point in points if point[2] is not None]
+            lats = [point[3] for point in points if point[9] is not None]
+            longs = [point[5] for point in points if point[9] is not None]
+            if timestamps:
+                max_duration = max(max_duration, max(timestamps) - min(timestamps))
+            cursor = connection.execute(
+                "INSERT INTO storms (basin, year, position, id, name, start_time, first_ts, last_ts, min_lat, max_lat, min_lon, max_lon)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (basin_abbr, int(year), position, typhoon_data.get("id"), typhoon_data.get("name"), typhoon_data.get("start_time"),
+                 min(timestamps, default=None), max(timestamps, default=None), min(lats, default=None), max(lats, default=None),
+                 min(longs, default=None), max(longs, default=None)))
+            connection.executemany(
+                "INSERT INTO track_points (storm_key, seq, time, ts, lat, long, norm_long, speed, pressure, class, cell)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(cursor.lastrowid,) + point for point in points])
+        # The longest storm bounds how far back an overlapping storm can start, which keeps time queries on the index.
+        connection.execute("INSERT INTO store_info (key, value) VALUES ('max_duration', ?)"
+                           " ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)", (max_duration,))
+
+def query_storms_active_between(t0, t1, db_path=None, basin_name=None):
+    t0, t1 = to_epoch(t0), to_epoch(t1)
+    with closing(connect_sqlite(db_path)) as connection:
+        row = connection.execute("SELECT value FROM store_info WHERE key = 'max_duration'").fetchone()
+        max_duration = row["value"] if row else 0
+        query = ("SELECT basin, year, position, id, name, start_time, first_ts, last_ts, min_lat, max_lat, min_lon, max_lon FROM storms"
+                 " WHERE first_ts BETWEEN ? AND ? AND last_ts >= ?")
+        parameters = [t0 - max_duration, t1, t0]
+        if basin_name:
+            query += " AND basin = ?"
+            parameters.append(BASIN_ABBREVIATIONS.get(basin_name, "unknown"))
+        return [dict(row) for row in connection.execute(query + " ORDER BY first_ts", parameters)]
+
+def bbox_longitudes(min_long, max_long):
+    # The box's west edge in [-180, 180) and its width in degrees; a box with min_long > max_long crosses
+    # the antimeridian, and a width of 360 or more covers every longitude.
+    span = max_long - min_long if min_long <= max_long else max_long - min_long + 360.0
+    return normalize_longitude(min_long), span
+
+def bbox_cells(min_lat, min_long, max_lat, max_long):
+    columns = int(360 // GRID_CELL_DEGREES)
+    first_row = grid_cell(min_lat, 0.0) // columns
+    last_row = grid_cell(max_lat, 0.0) // columns
+    west, span = bbox_longitudes(min_long, max_long)
+    first_column = grid_cell(0.0, west) % columns
+    last_column = grid_cell(0.0, west + span) % columns
+    if span >= 360.0:
+        column_range = list(range(columns))
+    elif west + span < 180.0:
+        column_range = list(range(first_column, last_column + 1))
+    else:
+        # The east edge is at or past +180, so the range wraps even when both edges share a column.
+        column_range = list(range(first_column, columns)) + list(range(0, last_column + 1))
+    return [row * columns + column for row in range(first_row, last_row + 1) for column in column_range]
+
+def query_points_in_bbox(min_lat, min_long, max_lat, max_long, db_path=None, t0=None, t1=None):
+    # Longitudes are compared after normalizing to [-180, 180); a box with min_long > max_long crosses the antimeridian
+    # and one spanning 360 degrees or more, such as (-180, 180) or (0, 360), matches every longitude.
+    cells = bbox_cells(min_lat, min_long, max_lat, max_long)
+    west, span = bbox_longitudes(min_long, max_long)
+    east = west + span
+    if span >= 360.0:
+        long_filter, parameters = "1", []
+    elif east < 180.0:
+        long_filter, parameters = "p.norm_long BETWEEN ? AND ?", [west, east]
+    else:
+        # The east edge lies at or past +180, which is stored as -180 and below.
+        long_filter, parameters = "(p.norm_long >= ? OR p.norm_long <= ?)", [west, east - 360.0]
+    query = (f"SELECT s.basin, s.year, s.id, s.name, p.seq, p.time, p.ts, p.lat, p.long, p.speed, p.pressure, p.class"
+             f" FROM track_points p JOIN storms s ON s.storm_key = p.storm_key"
+             f" WHERE p.cell IN ({', '.join('?' * len(cells))}) AND p.lat BETWEEN ? AND ? AND {long_filter}")
+    parameters = cells + [min_lat, max_lat] + parameters
+    if t0 is not None:
+        query += " AND p.ts >= ?"
+        parameters.append(to_epoch(t0))
+    if t1 is not None:
+        query += " AND p.ts <= ?"
+        parameters.append(to_epoch(t1))
+    with closing(connect_sqlite(db_path)) as connection:
+        return [dict(row) for row in connection.execute(query + " ORDER BY s.year, s.basin, s.position, p.seq", parameters)]
+
+def iter_cached_seasons(folder_path="data"):
+    basin_names = {basin_abbr: basin_name for basin_name, basin_abbr in BASIN_ABBREVIATIONS.items()}
+    seasons = set()
+    if os.path.isdir(folder_path):
+        for file_name in os.listdir(folder_path):
+            match = re.fullmatch(r"([a-z]+)_(\d+)_data\.(.+)", file_name)
+            if match and match.group(1) in basin_names and match.group(3) in CACHE_FORMATS:
+                seasons.add((int(match.group(2)), basin_names[match.group(1)]))
+    return sorted(seasons)
+
+def import_cache_into_sqlite(folder_path="data", db_path=None):
+    for year, basin_name in iter_cached_seasons(folder_path):
+        data = load_cache(year, basin_name, folder_path, touch=False)
+        if data is not None:
+            save_to_sqlite(data, year, basin_name, db_path)
+
+# Cross-year lookup table kept next to the caches: one entry per basin-year with the file it came from
+# and, for each storm in file order, [name, storm id, start time]. save_cache replaces a season's entry.
+STORM_INDEX_FILE = "storm_index.json"
+_storm_index_tables = {}
+_storm_index_lock = threading.Lock()
+
+def storm_index_path(folder_path="data"):
+    return os.path.join(folder_path, STORM_INDEX_FILE)
+
+def load_storm_index(folder_path="data"):
+    index_file = storm_index_path(folder_path)
+    if not os.path.exists(index_file):
+        return {"seasons": {}}
+    try:
+        with open(index_file, "r") as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError):
+        print(f"Error loading storm index {index_file}. Rebuilding it.")
+        return build_storm_index(folder_path)
+
+def season_index_entry(data, year, basin_name, cache_file):
+    return {
+        "year": int(year),
+        "basin": basin_name,
+        "file": os.path.basename(cache_file),
+        "storms": [[storm.get("name"), storm.get("id"), storm.get("start_time")] for storm in data or []],
+    }
+
+def write_storm_index(index, folder_path="data"):
+    with atomic_write(storm_index_path(folder_path)) as file:
+        json.dump(index, file, separators=(",", ":"))
+
+def remove_from_storm_index(year, basin_name, folder_path="data"):
+    if not os.path.exists(storm_index_path(folder_path)):
+        return
+    with _storm_index_lock, file_lock(lock_file_path(folder_path, "storm_index")):
+        index = load_storm_index(folder_path)
+        if index["seasons"].pop(f"{basin_name}/{year}", None) is not None:
+            write_storm_index(index, folder_path)
+
+def update_storm_index(data, year, basin_name, cache_file, folder_path="data"):
+    with _storm_index_lock, file_lock(lock_file_path(folder_path, "storm_index")):
+        index = load_storm_index(folder_path)
+        index["seasons"][f"{basin_name}/{year}"] = season_index_entry(data, year, basin_name, cache_file)
+        write_storm_index(index, folder_path)
+
+def build_storm_index(folder_path="data"):
+    index = {"seasons": {}}
+    for year, basin_name in iter_cached_seasons(folder_path):
+        data = load_cache(year, basin_name, folder_path, touch=False)
+        if data is not None:
+            cache_file, _ = find_cache_file(year, basin_name, folder_path)
+            index["seasons"][f"{basin_name}/{year}"] = season_index_entry(data, year, basin_name, cache_file)
+    write_storm_index(index, folder_path)
+    return index
+
+def storm_index_tables(folder_path="data"):
+    # The decoded index is kept in memory until the file changes, so repeated lookups are dict hits.
+    index_file = storm_index_path(folder_path)
+    mtime = os.stat(index_file).st_mtime_ns if os.path.exists(index_file) else None
+    cached = _storm_index_tables.get(index_file)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    by_name, by_id, by_year = {}, {}, {}
+    for season in load_storm_index(folder_path)["seasons"].values():
+        for position, (name, storm_id, start_time) in enumerate(season["storms"]):
+            entry = {"name": name, "id": storm_id, "year": season["year"], "basin": season["basin"],
+                     "file": season["file"], "position": position, "start_time": start_time}
+            by_name.setdefault((name or "").upper(), []).append(entry)
+            if storm_id:
+                by_id.setdefault(storm_id, []).append(entry)
+            by_year.setdefault(season["year"], []).append(entry)
+    tables = (by_name, by_id, by_year)
+    _storm_index_tables[index_file] = (mtime, tables)
+    return tables
+
+def find_storms(name=None, storm_id=None, year=None, folder_path="data"):
+    by_name, by_id, by_year = storm_index_tables(folder_path)
+    if storm_id is not None:
+        matches = by_id.get(storm_id, [])
+    elif name is not None:
+        matches = by_name.get(name.upper(), [])
+    elif year is not None:
+        matches = by_year.get(int(year), [])
+    else:
+        matches = [entry for entries in by_year.values() for entry in entries]
+    return sorted((entry for entry in matches
+                   if (name is None or (entry["name"] or "").upper() == name.upper())
+                   and (year is None or entry["year"] == int(year))),
+                  key=lambda entry: (entry["year"], entry["basin"], entry["position"]))
+
+def load_indexed_storm(entry, folder_path="data"):
+    data = load_cache(entry["year"], entry["basin"], folder_path)
+    return data[entry["position"]] if data is not None and entry["position"] < len(data) else None
+
+# Fixed-width record of the consolidated track archive. Missing times are TIME_MISSING, missing
+# positions NaN, and "< 35" / "> 1008" or unknown speed and pressure are -1.
+TRACK_RECORD_FIELDS = [("time", "<i8"), ("lat", "<f4"), ("lon", "<f4"), ("speed", "<i2"), ("pressure", "<i2"), ("class", "i1")]
+TIME_MISSING = -2 ** 63
+
+def track_records(typhoon_data):
+    dtype = np.dtype(TRACK_RECORD_FIELDS, align=True)
+    records = np.empty(len(typhoon_data["path"]), dtype=dtype)
+    for index, point in enumerate(typhoon_data["path"]):
+        time = point_time(point)
+        speed, pressure = point.get("speed"), point.get("pressure")
+        records[index] = (
+            to_epoch(time) if time else TIME_MISSING,
+            point["lat"] if point.get("lat") is not None else np.nan,
+            point["long"] if point.get("long") is not None else np.nan,
+            int(speed) if isinstance(speed, str) and speed.isdigit() else -1,
+            int(pressure) if isinstance(pressure, str) and pressure.isdigit() else -1,
+            point.get("class") or 0,
+        )
+    return records
+
+def build_track_archive(folder_path="data", archive_path=None):
+    # Packs every cached basin-year into archive_path/tracks.bin plus a JSON offset index, one season in memory at a time.
+    archive_path = archive_path or os.path.join(folder_path, "archive")
+    if not os.path.exists(archive_path):
+        os.makedirs(archive_path, exist_ok=True)
+    storms = []
+    offset = 0
+    with atomic_write(os.path.join(archive_path, "tracks.bin"), "wb") as records_file:
+        for year, basin_name in iter_cached_seasons(folder_path):
+            for position, typhoon_data in enumerate(load_cache(year, basin_name, folder_path, touch=False) or []):
+                records = track_records(typhoon_data)
+                records.tofile(records_file)
+                storms.append({"basin": BASIN_ABBREVIATIONS.get(basin_name, "unknown"), "year": year, "position": position,
+                               "id": typhoon_data.get("id"), "name": typhoon_data.get("name"),
+                               "start_time": typhoon_data.get("start_time"), "offset": offset, "count": len(records)})
+                offset += len(records)
+    with atomic_write(os.path.join(archive_path, "tracks_index.json")) as index_file:
+        json.dump({"fields": TRACK_RECORD_FIELDS, "records": offset, "storms": storms}, index_file)
+    print(f"Archived {len(storms)} storms ({offset} track points) to {archive_path}")
+
+class TrackArchive:
+    # Read-only view of a build_track_archive output. track() returns a slice of the memory map,
+    # so only the pages of the storms actually read are loaded from disk.
+    def __init__(self, archive_path="data/archive"):
+        with open(os.path.join(archive_path, "tracks_index.json"), "r") as index_file:
+            index = json.load(index_file)
+        self.storms = index["storms"]
+        self.dtype = np.dtype([tuple(field) for field in index["fields"]], align=True)
+        if index["records"]:
+            self.records = np.memmap(os.path.join(archive_path, "tracks.bin"), dtype=self.dtype, mode="r", shape=(index["records"],))
+        else:
+            self.records = np.empty(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.storms)
+
+    def __iter__(self):
+        for position, storm in enumerate(self.storms):
+            yield storm, self.track(position)
+
+    def track(self, position):
+        storm = self.storms[position]
+        return self.records[storm["offset"]:storm["offset"] + storm["count"]]
+
+    def find(self, name=None, basin_name=None, year=None):
+        basin_abbr = BASIN_ABBREVIATIONS.get(basin_name, "unknown") if basin_name else None
+        return [position for position, storm in enumerate(self.storms)
+                if (name is None or storm["name"] == name)
+                and (basin_abbr is None or storm["basin"] == basin_abbr)
+                and (year is None or storm["year"] == int(year))]
+
+# In-memory storm model: a Track keeps each path key in its own typed column, a few dozen bytes a
+# point instead of a dict of boxed values. Canonical values map onto the columns (display time as
+# epoch seconds, "< 35" / "> 1008" as sentinels); any point that wouldn't come back identical is
+# kept verbatim in `irregular`, so Track.from_points(points).to_points() == points always holds.
+POINT_KEYS = ("time", "lat", "long", "speed", "pressure", "class")
+SPEED_BELOW = -2 ** 31
+PRESSURE_ABOVE = -2 ** 31
+_track_day_text = {}
+
+def encode_display_time(text):
+    # "YYYY-MM-DD HH:MM" -> epoch seconds, only when decode_display_time gives the same text back.
+    if not isinstance(text, str) or len(text) != 16 or text[10] != " " or text[13] != ":":
+        return None
+    day = parse_track_date(text[:10])
+    clock = text[11:13] + text[14:]
+    if not day or not (clock.isascii() and clock.isdigit()) or int(text[11:13]) > 23 or int(text[14:]) > 59:
+        return None
+    _track_day_text.setdefault(day[0], text[:10])
+    return day[0] * 86400 + int(text[11:13]) * 3600 + int(text[14:]) * 60
+
+def encode_display_times(texts):
+    # Vectorized encode_display_time over a NumPy string array: the epochs and a mask of the texts it
+    # would reject, whose epoch is TIME_MISSING.
+    valid, fields = track_time_fields(texts, seconds=False)
+    days = track_days(valid, fields)
+    # decode_display_time looks the day text up, as encode_display_time would have recorded it.
+    unique_days, first = np.unique(days[valid], return_index=True)
+    valid_texts = texts[valid]
+    for day_number, index in zip(unique_days.tolist(), first.tolist()):
+        _track_day_text.setdefault(day_number, valid_texts[index][:10])
+    epochs = np.where(valid, days * 86400 + fields[:, 3] * 3600 + fields[:, 4] * 60, TIME_MISSING)
+    return epochs, ~valid
+
+def decode_display_time(epoch):
+    days, seconds = divmod(epoch, 86400)
+    day_text = _track_day_text.get(days)
+    if day_text is None:
+        day_text = _track_day_text.setdefault(days, (TRACK_EPOCH + timedelta(days=days)).strftime("%Y-%m-%d"))
+    return f"{day_text} {seconds // 3600:02d}:{seconds % 3600 // 60:02d}"
+
+def encode_reading(text, sentinel_text, sentinel):
+    if text == sentinel_text:
+        return sentinel
+    if isinstance(text, str) and text.isascii() and text.lstrip("-").isdigit():
+        value = int(text)
+        if str(value) == text and -2 ** 31 < value < 2 ** 31:
+            return value
+    return None
+
+class Track:
+    __slots__ = ("times", "lats", "longs", "speeds", "pressures", "classes", "irregular")
+
+    def __init__(self):
+        self.times = array("q")
+        self.lats = array("d")
+        self.longs = array("d")
+        self.speeds = array("i")
+        self.pressures = array("i")
+        self.classes = array("b")
+        self.irregular = {}
+
+    @classmethod
+    def from_points(cls, points):
+        track = cls()
+        for point in points:
+            track.append(point)
+        return track
+
+    def append(self, point):
+        time, lat, long = point.get("time"), point.get("lat"), point.get("long")
+        typhoon_class = point.get("class")
+        epoch = TIME_MISSING if time is None else encode_display_time(time)
+        speed = encode_reading(point.get("speed"), "< 35", SPEED_BELOW)
+        pressure = encode_reading(point.get("pressure"), "> 1008", PRESSURE_ABOVE)
+        regular = (tuple(point) == POINT_KEYS and epoch is not None and speed is not None and pressure is not None
+                   and all(value is None or (type(value) is float and value == value) for value in (lat, long))
+                   and type(typhoon_class) is int and 0 <= typhoon_class <= 5)
+        if not regular:
+            self.irregular[len(self.times)] = dict(point)
+            epoch, speed, pressure, typhoon_class = TIME_MISSING, SPEED_BELOW, PRESSURE_ABOVE, 0
+            lat = lat if type(lat) is float else None
+            long = long if type(long) is float else None
+        self.times.append(epoch)
+        self.lats.append(math.nan if lat is None else lat)
+        self.longs.append(math.nan if long is None else long)
+        self.speeds.append(speed)
+        self.pressures.append(pressure)
+        self.classes.append(typhoon_class)
+
+    def __len__(self):
+        return len(self.times)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.times)
+        if index in self.irregular:
+            return dict(self.irregular[index])
+        epoch, lat, long = self.times[index], self.lats[index], self.longs[index]
+        speed, pressure = self.speeds[index], self.pressures[index]
+        return {
+            "time": None if epoch == TIME_MISSING else decode_display_time(epoch),
+            "lat": None if lat != lat else lat,
+            "long": None if long != long else long,
+            "speed": "< 35" if speed == SPEED_BELOW else str(speed),
+            "pressure": "> 1008" if pressure == PRESSURE_ABOVE else str(pressure),
+            "class": self.classes[index],
+        }
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self.times)))
+
+    def to_points(self):
+        return list(self)
+
+    def column(self, name):
+        # Zero-copy NumPy view of a column ("times", "lats", ...) when numpy is installed.
+        values = getattr(self, name)
+        return np.frombuffer(values, dtype=values.typecode) if np is not None else values
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in (self.times, self.lats, self.longs, self.speeds, self.pressures, self.classes))
+
+class Storm:
+    __slots__ = ("name", "track", "fields", "values")
+
+    _field_orders = {}
+
+    def __init__(self, name, track, fields=("name", "path"), values=()):
+        self.name = name
+        self.track = track
+        # Key order of the source dict (shared between storms) and the other top-level values in that order.
+        self.fields = fields
+        self.values = values
+
+    @classmethod
+    def from_dict(cls, typhoon_data):
+        fields = tuple(typhoon_data)
+        fields = cls._field_orders.setdefault(fields, fields)
+        values = tuple(value for key, value in typhoon_data.items() if key not in ("name", "path"))
+        return cls(typhoon_data.get("name"), Track.from_points(typhoon_data.get("path", [])), fields, values)
+
+    def to_dict(self):
+        typhoon_data = {}
+        values = iter(self.values)
+        for key in self.fields:
+            if key == "name":
+                typhoon_data[key] = self.name
+            elif key == "path":
+                typhoon_data[key] = self.track.to_points()
+            else:
+                typhoon_data[key] = next(values)
+        return typhoon_data
+
+    def get(self, key, default=None):
+        if key == "name":
+            return self.name
+        if key == "path":
+            return self.track.to_points()
+        others = [field for field in self.fields if field not in ("name", "path")]
+        return self.values[others.index(key)] if key in others else default
+
+    @property
+    def start_time(self):
+        return self.get("start_time")
+
+    @property
+    def id(self):
+        return self.get("id")
+
+    def __repr__(self):
+        return f"Storm({self.name!r}, points={len(self.track)})"
+
+def encoded_lookup(categories, encode, fallback):
+    # Encodes each distinct string once; returns the encoded values and which categories didn't encode.
+    encoded = [encode(text) for text in categories.tolist()]
+    return (np.array([fallback if value is None else value for value in encoded], dtype=np.int64),
+            np.array([value is None for value in encoded], dtype=bool))
+
+def storms_from_columns(storms, offsets, columns):
+    # Builds Storms straight from the columnar layout of a season ({key: (kind, arrays)} as written by
+    # save_npz_cache), without a dict per point. Only points Track would keep as irregular are turned into
+    # dicts. Returns None when the columns aren't the usual six, and the caller goes through dicts instead.
+    if tuple(columns) != POINT_KEYS or any("missing" in arrays for _, arrays in columns.values()):
+        return None
+    count = int(offsets[-1])
+    decoded = {}
+    for key, (kind, arrays) in columns.items():
+        nulls = arrays.get("nulls", np.zeros(count, dtype=bool))
+        if kind == "int" and nulls.all():
+            # A column with no values at all is stored as "int".
+            kind = "null"
+        if key == "time" and kind in ("str", "null"):
+            if kind == "str":
+                lookup, bad = encode_display_times(arrays["categories"])
+                values, irregular = lookup[arrays["values"]], bad[arrays["values"]] & ~nulls
+            else:
+                values, irregular = np.zeros(count, dtype=np.int64), np.zeros(count, dtype=bool)
+            values[nulls] = TIME_MISSING
+        elif key in ("lat", "long") and kind in ("float", "null"):
+            values = arrays["values"].astype(np.float64) if kind == "float" else np.zeros(count)
+            irregular = np.isnan(values) & ~nulls
+            values[nulls] = math.nan
+        elif key in ("speed", "pressure") and kind == "str":
+            sentinel_text, sentinel = ("< 35", SPEED_BELOW) if key == "speed" else ("> 1008", PRESSURE_ABOVE)
+            lookup, bad = encoded_lookup(arrays["categories"], partial(encode_reading, sentinel_text=sentinel_text, sentinel=sentinel), sentinel)
+            values, irregular = lookup[arrays["values"]], bad[arrays["values"]] | nulls
+        elif key == "class" and kind == "int":
+            values = arrays["values"].astype(np.int64)
+            irregular = nulls | (values < 0) | (values > 5)
+        else:
+            return None
+        decoded[key] = (values, irregular)
+    irregular = np.zeros(count, dtype=bool)
+    for _, key_irregular in decoded.values():
+        irregular |= key_irregular
+    # Irregular points keep the placeholders Track.append stores for them.
+    for key, placeholder in (("time", TIME_MISSING), ("speed", SPEED_BELOW), ("pressure", PRESSURE_ABOVE), ("class", 0)):
+        decoded[key][0][irregular] = placeholder
+    irregular_points = {}
+    if irregular.any():
+        values_by_key = {key: decode_column(kind, arrays) for key, (kind, arrays) in columns.items()}
+        irregular_points = {index: {key: values_by_key[key][index] for key in POINT_KEYS} for index in np.flatnonzero(irregular).tolist()}
+    column_arrays = [(name, decoded[key][0].astype(dtype)) for name, key, dtype in
+                     (("times", "time", np.int64), ("lats", "lat", np.float64), ("longs", "long", np.float64),
+                      ("speeds", "speed", np.int32), ("pressures", "pressure", np.int32), ("classes", "class", np.int8))]
+    result = []
+    for index, typhoon_data in enumerate(storms):
+        start, end = int(offsets[index]), int(offsets[index + 1])
+        track = Track()
+        for name, values in column_arrays:
+            getattr(track, name).frombytes(values[start:end].tobytes())
+        track.irregular = {position - start: point for position, point in irregular_points.items() if start <= position < end}
+        fields = tuple(typhoon_data)
+        fields = Storm._field_orders.setdefault(fields, fields)
+        values = tuple(value for key, value in typhoon_data.items() if key not in ("name", "path"))
+        result.append(Storm(typhoon_data.get("name"), track, fields, values))
+    return result
+
+def load_npz_storms(cache_file):
+    with np.load(cache_file, allow_pickle=False) as npz:
+        header = json.loads(npz["header"].item())
+        columns = {}
+        for index, column in enumerate(header["columns"]):
+            prefix = f"c{index}_"
+            columns[column["key"]] = (column["kind"], {name[len(prefix):]: npz[name] for name in npz.files if name.startswith(prefix)})
+        storms = storms_from_columns(header["storms"], npz["offsets"], columns)
+    return storms if storms is not None else storms_from_dicts(load_npz_cache, cache_file)
+
+def parquet_column(values):
+    # One path field of a Parquet season in the npz column layout, or None for a type we don't map.
+    nulls = values.is_null().to_numpy(zero_copy_only=False)
+    if pyarrow.types.is_string(values.type) or pyarrow.types.is_large_string(values.type):
+        encoded = values.dictionary_encode()
+        arrays = {"values": encoded.indices.fill_null(0).to_numpy(zero_copy_only=False),
+                  "categories": encoded.dictionary.to_numpy(zero_copy_only=False).astype(str)}
+        kind = "str"
+    elif pyarrow.types.is_floating(values.type):
+        kind, arrays = "float", {"values": values.fill_null(0.0).to_numpy(zero_copy_only=False)}
+    elif pyarrow.types.is_integer(values.type):
+        kind, arrays = "int", {"values": values.fill_null(0).to_numpy(zero_copy_only=False)}
+    elif pyarrow.types.is_null(values.type):
+        kind, arrays = "int", {"values": np.zeros(len(values), dtype=np.int64)}
+    else:
+        return None
+    if nulls.any():
+        arrays["nulls"] = nulls
+    return kind, arrays
+
+def load_parquet_storms(cache_file):
+    table = pyarrow.parquet.read_table(cache_file)
+    storms = None
+    if np is not None and "path" in table.column_names and pyarrow.types.is_list(table.schema.field("path").type):
+        paths = table.column("path").combine_chunks()
+        points = paths.flatten()
+        if pyarrow.types.is_struct(points.type):
+            columns = {points.type.field(index).name: parquet_column(points.field(index)) for index in range(points.type.num_fields)}
+            if None not in columns.values():
+                # Storm-level fields keep the table's column order, with "path" as a placeholder.
+                rows = table.drop_columns(["path"]).to_pylist()
+                header = [{key: None if key == "path" else row[key] for key in table.column_names} for row in rows]
+                storms = storms_from_columns(header, paths.offsets.to_numpy(), columns)
+    return storms if storms is not None else [Storm.from_dict(typhoon_data) for typhoon_data in table.to_pylist()]
+
+def storms_from_dicts(reader, cache_file):
+    return [Storm.from_dict(typhoon_data) for typhoon_data in reader(cache_file)]
+
+# load_storms reads every format into Storms; npz and Parquet fill the Track columns from their arrays.
+STORM_READERS = {cache_format: partial(storms_from_dicts, reader) for cache_format, reader in CACHE_READERS.items()}
+STORM_READERS.update({"npz": load_npz_storms, "parquet": load_parquet_storms})
+
+def load_storms(year, basin_name, folder_path="data", cache_format=None, touch=True):
+    return load_cache(year, basin_name, folder_path, cache_format, touch, STORM_READERS)
+
+def load_all_storms(folder_path="data"):
+    # Every cached season as Storm objects, decoded one season at a time.
+    return {(year, basin_name): load_storms(year, basin_name, folder_path, touch=False) or [] for year, basin_name in iter_cached_seasons(folder_path)}
+
+_cache_manifest_lock = threading.Lock()
+
+def season_key(year, basin_name):
+    return f"{BASIN_ABBREVIATIONS.get(basin_name, 'unknown')}_{year}"
+
+def season_files(year, basin_name, folder_path="data"):
+    # Every file that belongs to one basin-year: the cache in any format plus its headers sidecar.
+    paths = [cache_file_path(year, basin_name, folder_path, cache_format) for cache_format in CACHE_FORMATS]
+    paths.append(headers_file_path(year, basin_name, folder_path))
+    paths.append(schema_v2_file_path(year, basin_name, folder_path))
+    return [path for path in paths if os.path.exists(path)]
+
+def load_cache_manifest(folder_path="data"):
+    manifest_file = os.path.join(folder_path, CACHE_MANIFEST_FILE)
+    if not os.path.exists(manifest_file):
+        return {}
+    try:
+        with open(manifest_file, "r") as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def touch_cache_entry(year, basin_name, folder_path="data"):
+    # Last access times live in a manifest rather than the files' atime, which many mounts don't update.
+    # Recording them is best-effort, so a read-only cache folder can still be read.
+    try:
+        with _cache_manifest_lock, file_lock(lock_file_path(folder_path, "cache_manifest")):
+            manifest = load_cache_manifest(folder_path)
+            manifest[season_key(year, basin_name)] = datetime.now(timezone.utc).timestamp()
+            with atomic_write(os.path.join(folder_path, CACHE_MANIFEST_FILE)) as file:
+                json.dump(manifest, file)
+    except OSError as e:
+        print(f"Could not record access to {season_key(year, basin_name)} in the cache manifest: {e}")
+
+def is_season_open(year, now=None):
+    # Southern Hemisphere seasons run from July into the next year, so last year's season stays open until July.
+    now = now or datetime.now(timezone.utc)
+    return int(year) >= now.year or (int(year) == now.year - 1 and now.month < 7)
+
+def season_ttl(year, now=None):
+    return timedelta(hours=OPEN_SEASON_TTL_HOURS) if is_season_open(year, now) else None
+
+def is_cache_expired(year, basin_name, folder_path="data", now=None):
+    ttl = season_ttl(year, now)
+    cache_file, _ = find_cache_file(year, basin_name, folder_path)
+    if ttl is None or cache_file is None:
+        return False
+    now = now or datetime.now(timezone.utc)
+    written = datetime.fromtimestamp(os.path.getmtime(cache_file), timezone.utc)
+    return now - written > ttl
+
+def evict_season(year, basin_name, folder_path="data"):
+    freed = 0
+    for path in season_files(year, basin_name, folder_path):
+        freed += os.path.getsize(path)
+        os.remove(path)
+    remove_from_storm_index(year, basin_name, folder_path)
+    with _counters_lock:
+        CACHE_STATS["evictions"] += 1
+        CACHE_STATS["evicted_bytes"] += freed
+    print(f"Evicted {basin_name} {year} from the cache ({freed} bytes).")
+    return freed
+
+def enforce_cache_budget(folder_path="data", max_bytes=None, keep=None):
+    # Evicts least recently used seasons until the folder fits; `keep` (year, basin_name) is never evicted.
+    max_bytes = max_bytes if max_bytes is not None else CACHE_MAX_BYTES
+    if max_bytes is None:
+        return 0
+    manifest = load_cache_manifest(folder_path)
+    seasons = []
+    for year, basin_name in iter_cached_seasons(folder_path):
+        paths = season_files(year, basin_name, folder_path)
+        last_access = manifest.get(season_key(year, basin_name), max(os.path.getmtime(path) for path in paths))
+        seasons.append((last_access, year, basin_name, sum(os.path.getsize(path) for path in paths)))
+    total = sum(season[3] for season in seasons)
+    freed = 0
+    for _, year, basin_name, _ in sorted(seasons):
+        if total - freed <= max_bytes:
+            break
+        if keep is not None and (int(keep[0]), keep[1]) == (year, basin_name):
+            continue
+        freed += evict_season(year, basin_name, folder_path)
+    if freed:
+        with _cache_manifest_lock, file_lock(lock_file_path(folder_path, "cache_manifest")):
+            manifest = load_cache_manifest(folder_path)
+            cached = {season_key(year, basin_name) for year, basin_name in iter_cached_seasons(folder_path)}
+            with atomic_write(os.path.join(folder_path, CACHE_MANIFEST_FILE)) as file:
+                json.dump({key: value for key, value in manifest.items() if key in cached}, file)
+    return freed
+
+def after_cache_write(year, basin_name, folder_path="data"):
+    touch_cache_entry(year, basin_name, folder_path)
+    enforce_cache_budget(folder_path, keep=(year, basin_name))
+
+def cache_report():
+    lookups = CACHE_STATS["hits"] + CACHE_STATS["misses"]
+    if not lookups and not CACHE_STATS["evictions"]:
+        return None
+    return (f"Cache: {CACHE_STATS['hits']} hits, {CACHE_STATS['misses']} misses, {CACHE_STATS['expired']} expired, "
+            f"{CACHE_STATS['evictions']} evictions ({CACHE_STATS['evicted_bytes']} bytes freed).")
+
+def schema_v2_file_path(year, basin_name, folder_path="data"):
+    basin_abbr = BASIN_ABBREVIATIONS.get(basin_name, "unknown")
+    return os.path.join(folder_path, f"{basin_abbr}_{year}_v2.json")
+
+def reading_value(text):
+    # Same number script.js derived from v1 strings: the digits of the text, or 0 ("< 35" -> 35).
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return text
+    digits = re.sub(r"[^0-9]", "", text) if isinstance(text, str) else ""
+    return int(digits) if digits else 0
+
+def point_to_v2(point):
+    time = point.get("time")
+    epoch = encode_display_time(time)
+    if epoch is None:
+        time_obj = point_time(point)
+        if time_obj is None:
+            return None
+        epoch = calendar.timegm(time_obj.timetuple())
+    speed, pressure = point.get("speed"), point.get("pressure")
+    return {
+        "timestamp": epoch * 1000,
+        "lat": point.get("lat"),
+        "long": point.get("long"),
+        "speed": reading_value(speed),
+        "speed_below": speed == "< 35",
+        "pressure": reading_value(pressure) if pressure is not None else None,
+        "pressure_above": pressure == "> 1008",
+        "class": point.get("class"),
+    }
+
+def storm_to_v2(typhoon_data):
+    # Points without a usable time are left out (the browser had no place for them on the timeline either).
+    path = [point for point in map(point_to_v2, typhoon_data.get("path", [])) if point is not None]
+    path.sort(key=lambda point: point["timestamp"])
+    storm = {key: value for key, value in typhoon_data.items() if key != "path"}
+    storm["path"] = path
+    return storm
+
+def encode_storm_v2(typhoon_data):
+    # None for a storm with no timed points; it is left out of the v2 file.
+    storm = storm_to_v2(typhoon_data)
+    return compact_json_bytes(storm) if storm["path"] else None
+
+def save_schema_v2(data, year, basin_name, folder_path="data"):
+    # Written storm by storm, so `data` may be any iterable of v1 storms (e.g. lazy handles).
+    with atomic_write(schema_v2_file_path(year, basin_name, folder_path), "wb") as file:
+        file.write(b'{"version":2,"storms":[')
+        written = 0
+        for typhoon_data in data:
+            encoded = encode_storm_v2(typhoon_data)
+            if encoded is not None:
+                file.write((b"," if written else b"") + encoded)
+                written += 1
+        file.write(b"]}")
+
+def load_schema_v2(year, basin_name, folder_path="data"):
+    with open(schema_v2_file_path(year, basin_name, folder_path), "rb") as file:
+        return loads_json(file.read())
+
+def save_cache(data, year, basin_name, folder_path="data", cache_format=None):
+    cache_format = cache_format or CACHE_FORMAT
+    if not cache_format_available(cache_format):
+        print(f"Cache format '{cache_format}' is not available. Writing JSON instead.")
+        cache_format = "json"
     if not os.path.exists(folder_path):
-        os.makedirs(folder_path)
-    cache_file = os.path.join(folder_path, f"{basin_abbr}_{year}_data.json")
-    with open(cache_file, "w") as file:
-        json.dump(data, file, indent=4)
+        os.makedirs(folder_path, exist_ok=True)
+    cache_file = cache_file_path(year, basin_name, folder_path, cache_format)
+    try:
+        spans = CACHE_WRITERS[cache_format](data, cache_file)
+    except (TypeError, ValueError) as error:
+        if cache_format == "json":
+            raise
+        # e.g. pyarrow cannot infer one type for a column; drop the stale file so load_cache doesn't prefer it.
+        print(f"Could not write {cache_format} cache ({error}). Writing JSON instead.")
+        if os.path.exists(cache_file):
+            os.remove(cache_file)
+        cache_file = cache_file_path(year, basin_name, folder_path, "json")
+        spans = save_json_cache(data, cache_file)
     print(f"Data cached to file: {cache_file}")
+    save_storm_headers(data, year, basin_name, cache_file, spans, folder_path)
+    update_storm_index(data, year, basin_name, cache_file, folder_path)
+    if SQLITE_DB_PATH:
+        save_to_sqlite(data, year, basin_name)
+    if WRITE_SCHEMA_V2:
+        save_schema_v2(data, year, basin_name, folder_path)
+    after_cache_write(year, basin_name, folder_path)
+
+def recover_partial_cache(partial_file):
+    # The storms written before a crash are complete JSON values; a torn last one is dropped.
+    if not os.path.exists(partial_file):
+        return []
+    with open(partial_file, "r") as file:
+        content = file.read()
+    decoder = json.JSONDecoder()
+    storms = []
+    position = content.find("[") + 1
+    while position > 0:
+        while position < len(content) and content[position] in " \t\r\n,":
+            position += 1
+        try:
+            typhoon_data, position = decoder.raw_decode(content, position)
+        except ValueError:
+            break
+        storms.append(typhoon_data)
+    if storms:
+        print(f"Recovered {len(storms)} storms from {partial_file}.")
+    return storms
 
-def load_cache(year, basin_name, folder_path="data"):
+class SeasonStreamWriter:
+    # Appends storms to "<cache file>.partial" as they are scraped and renames it into place on
+    # close(). The result is the same file save_json_cache would write for the same storms.
+    # With WRITE_SCHEMA_V2 each storm is also converted while it is still in memory.
+    def __init__(self, year, basin_name, folder_path="data"):
+        self.year = year
+        self.basin_name = basin_name
+        self.folder_path = folder_path
+        if not os.path.exists(folder_path):
+            os.makedirs(folder_path, exist_ok=True)
+        self.cache_file = cache_file_path(year, basin_name, folder_path, "json")
+        self.partial_file = f"{self.cache_file}.partial"
+        recovered = recover_partial_cache(self.partial_file)
+        self.recovered_ids = {typhoon_data.get("id") for typhoon_data in recovered if typhoon_data.get("id")}
+        self.headers = []
+        self.offset = 0
+        self.file = open(self.partial_file, "wb")
+        self.v2_file = None
+        self.v2_written = 0
+        if WRITE_SCHEMA_V2:
+            self.v2_file = open(f"{schema_v2_file_path(year, basin_name, folder_path)}.partial", "wb")
+            self.v2_file.write(b'{"version":2,"storms":[')
+        for typhoon_data in recovered:
+            self.write(typhoon_data)
+
+    def write(self, typhoon_data):
+        encoded = dumps_storm_json(typhoon_data)
+        self.offset += self.file.write(b",\n    " if self.headers else b"[\n    ")
+        self.headers.append(storm_header(typhoon_data, [self.offset, self.offset + len(encoded)]))
+        self.offset += self.file.write(encoded)
+        self.file.flush()
+        if self.v2_file is not None:
+            encoded = encode_storm_v2(typhoon_data)
+            if encoded is not None:
+                self.v2_file.write((b"," if self.v2_written else b"") + encoded)
+                self.v2_written += 1
+
+    def close(self):
+        self.file.write(b"\n]" if self.headers else b"[]")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.partial_file, self.cache_file)
+        print(f"Data cached to file: {self.cache_file}")
+        if self.v2_file is not None:
+            self.v2_file.write(b"]}")
+            self.v2_file.close()
+            os.replace(self.v2_file.name, schema_v2_file_path(self.year, self.basin_name, self.folder_path))
+        save_storm_headers(None, self.year, self.basin_name, self.cache_file, folder_path=self.folder_path, storm_headers=self.headers)
+        update_storm_index(self.headers, self.year, self.basin_name, self.cache_file, self.folder_path)
+        if SQLITE_DB_PATH:
+            save_to_sqlite(load_storm_headers(self.year, self.basin_name, self.folder_path, "json"), self.year, self.basin_name)
+        after_cache_write(self.year, self.basin_name, self.folder_path)
+
+def find_cache_file(year, basin_name, folder_path="data", cache_format=None):
+    cache_format = cache_format or CACHE_FORMAT
+    for candidate in [cache_format] + [other for other in CACHE_FORMATS if other != cache_format]:
+        cache_file = cache_file_path(year, basin_name, folder_path, candidate)
+        if os.path.exists(cache_file) and cache_format_available(candidate):
+            return cache_file, candidate
+    return None, None
+
+def load_cache(year, basin_name, folder_path="data", cache_format=None, touch=True, readers=None):
+    cache_file, cache_format = find_cache_file(year, basin_name, folder_path, cache_format)
+    if cache_file is None:
+        with _counters_lock:
+            CACHE_STATS["misses"] += 1
+        return None
+    try:
+        data = (readers or CACHE_READERS)[cache_format](cache_file)
+        print(f"Loaded data from cache: {cache_file}")
+    except CACHE_READ_ERRORS:
+        print(f"Error loading cache file {cache_file}. Scraping new data.")
+        with _counters_lock:
+            CACHE_STATS["misses"] += 1
+        return None
+    with _counters_lock:
+        CACHE_STATS["hits"] += 1
+    # Bulk readers that sweep every season pass touch=False; they would otherwise rewrite the manifest once
+    # per season and make every season look recently used to the eviction policy.
+    if touch:
+        touch_cache_entry(year, basin_name, folder_path)
+    return data
+
+def headers_file_path(year, basin_name, folder_path="data"):
     basin_abbr = BASIN_ABBREVIATIONS.get(basin_name, "unknown")
-    cache_file = os.path.join(folder_path, f"{basin_abbr}_{year}_data.json")
-    if os.path.exists(cache_file):
-        with open(cache_file, "r") as file:
+    return os.path.join(folder_path, f"{basin_abbr}_{year}_headers.json")
+
+def storm_header(typhoon_data, span=None):
+    lats = [point["lat"] for point in typhoon_data.get("path", []) if point.get("lat") is not None]
+    longs = [point["long"] for point in typhoon_data.get("path", []) if point.get("long") is not None]
+    header = {key: value for key, value in typhoon_data.items() if key != "path"}
+    header["points"] = len(typhoon_data.get("path", []))
+    header["bbox"] = [min(lats), min(longs), max(lats), max(longs)] if lats and longs else None
+    header["span"] = span
+    return header
+
+def save_storm_headers(data, year, basin_name, cache_file, spans=None, folder_path="data", storm_headers=None):
+    # The sidecar remembers the size and mtime of the cache file it describes, so a cache written
+    # by something else (or an older version) is detected as stale instead of being misread.
+    stat = os.stat(cache_file)
+    if storm_headers is None:
+        storm_headers = [storm_header(storm, spans[position] if spans else None) for position, storm in enumerate(data or [])]
+    headers = {
+        "file": os.path.basename(cache_file),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "storms": storm_headers,
+    }
+    with atomic_write(headers_file_path(year, basin_name, folder_path)) as file:
+        json.dump(headers, file, separators=(",", ":"))
+    return headers
+
+class StormHandle:
+    # A storm whose header (name, start_time, id, active, points, bbox) is in memory and whose path
+    # is only decoded when first used. Reads like the storm dict for code that indexes it.
+    def __init__(self, header, loader):
+        self.header = header
+        self._loader = loader
+        self._storm = None
+
+    @property
+    def name(self):
+        return self.header.get("name")
+
+    @property
+    def start_time(self):
+        return self.header.get("start_time")
+
+    @property
+    def points(self):
+        return self.header["points"]
+
+    @property
+    def bbox(self):
+        return self.header["bbox"]
+
+    @property
+    def path(self):
+        return self.storm()["path"]
+
+    def storm(self):
+        if self._storm is None:
+            self._storm = self._loader()
+        return self._storm
+
+    def read(self):
+        # Decodes the storm without keeping it, for one pass over a season that shouldn't hold every path.
+        return self._storm if self._storm is not None else self._loader()
+
+    def keys(self):
+        return [key for key in self.header if key not in ("points", "bbox", "span")] + ["path"]
+
+    def __getitem__(self, key):
+        if key in self.header and key not in ("points", "bbox", "span"):
+            return self.header[key]
+        return self.storm()[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"StormHandle({self.name!r}, points={self.points})"
+
+def read_storm_span(cache_file, span):
+    with open(cache_file, "rb") as file:
+        file.seek(span[0])
+        return loads_json(file.read(span[1] - span[0]))
+
+def load_storm_headers(year, basin_name, folder_path="data", cache_format=None):
+    cache_file, cache_format = find_cache_file(year, basin_name, folder_path, cache_format)
+    if cache_file is None:
+        return None
+    headers = None
+    headers_file = headers_file_path(year, basin_name, folder_path)
+    if os.path.exists(headers_file):
+        try:
+            with open(headers_file, "rb") as file:
+                headers = loads_json(file.read())
+        except (OSError, json.JSONDecodeError):
+            headers = None
+    stat = os.stat(cache_file)
+    if headers is None or (headers.get("file"), headers.get("size"), headers.get("mtime_ns")) != (os.path.basename(cache_file), stat.st_size, stat.st_mtime_ns):
+        # Missing or stale sidecar: decode once, keep the storms for the handles and rewrite the sidecar.
+        data = load_cache(year, basin_name, folder_path, cache_format)
+        if data is None:
+            return None
+        headers = save_storm_headers(data, year, basin_name, cache_file, folder_path=folder_path)
+        return [StormHandle(header, partial(lambda storm: storm, storm)) for header, storm in zip(headers["storms"], data)]
+    season = {}
+    def load_from_season(position):
+        # Formats without byte spans decode the whole season once, on the first path access.
+        if "data" not in season:
+            season["data"] = CACHE_READERS[cache_format](cache_file)
+        return season["data"][position]
+    handles = []
+    for position, header in enumerate(headers["storms"]):
+        if header.get("span") and cache_format == "json":
+            loader = partial(read_storm_span, cache_file, header["span"])
+        else:
+            loader = partial(load_from_season, position)
+        handles.append(StormHandle(header, loader))
+    return handles
+
+# Lower bounds of classes 1-5 in knots; a speed's class is the number of bounds at or below it.
+CLASS_SPEED_BOUNDS = [34, 64, 83, 96, 113]
+DAYS_IN_MONTH = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+TRACK_EPOCH = datetime(1970, 1, 1)
+_track_dates = {}
+
+def parse_track_date(date_text):
+    # "YYYY-MM-DD" -> (days since 1970-01-01, month), or False. Cached, since a storm's rows share a few dates.
+    parsed = _track_dates.get(date_text)
+    if parsed is None:
+        parsed = False
+        digits = date_text[:4] + date_text[5:7] + date_text[8:]
+        # Years before 1000 are left to strptime/strftime, which don't zero-pad them.
+        if date_text[4] == "-" and date_text[7] == "-" and digits.isascii() and digits.isdigit() and date_text[0] != "0":
             try:
-                data = json.load(file)
-                print(f"Loaded data from cache: {cache_file}")
-                return data
-            except json.JSONDecodeError:
-                print(f"Error loading cache file {cache_file}. Scraping new data.")
-                return None
-    return None
+                day = datetime(int(date_text[:4]), int(date_text[5:7]), int(date_text[8:]))
+                parsed = ((day - TRACK_EPOCH).days, day.month)
+            except ValueError:
+                pass
+        _track_dates[date_text] = parsed
+    return parsed
 
-def save_data_as_json(year, basin_name, month=None, folder_path="data"):
-    links_by_basin = extract_links_from_second_table(fetch_year_page(year))
+def parse_track_time(text):
+    # Fixed-format stand-in for strptime(text, "%Y-%m-%d %H:%M:%S"): returns the display string
+    # ("%Y-%m-%d %H:%M"), the UTC epoch and the month, or None where strptime raises ValueError.
+    # Rows outside the zero-padded layout go through strptime itself.
+    if len(text) == 19 and text[10] == " " and text[13] == ":" and text[16] == ":":
+        day = parse_track_date(text[:10])
+        clock = text[11:13] + text[14:16] + text[17:]
+        if day and clock.isascii() and clock.isdigit():
+            hour, minute, second = int(text[11:13]), int(text[14:16]), int(text[17:])
+            if hour < 24 and minute < 60 and second < 60:
+                return text[:16], day[0] * 86400 + hour * 3600 + minute * 60 + second, day[1]
+    try:
+        time_obj = datetime.strptime(text, "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+    return time_obj.strftime("%Y-%m-%d %H:%M"), calendar.timegm(time_obj.timetuple()), time_obj.month
+
+def strptime_track_time(text):
+    # What parse_track_time stands in for, kept as the reference check_track_times compares it with.
+    try:
+        time_obj = datetime.strptime(text, "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+    return time_obj.strftime("%Y-%m-%d %H:%M"), calendar.timegm(time_obj.timetuple()), time_obj.month
+
+def iter_track_time_texts(folder_path="data", archive_folder=None):
+    # Yields (source, text) for every track time in the caches of folder_path (as the "%H:%M:%S" text
+    # they were parsed from) and in every storm page of the raw archive (after the dates are filled in).
+    for year, basin_name in iter_cached_seasons(folder_path):
+        for typhoon_data in load_cache(year, basin_name, folder_path, touch=False) or []:
+            for point in typhoon_data.get("path", []):
+                if isinstance(point.get("time"), str):
+                    yield f"{basin_name} {year} {typhoon_data.get('id')}", f"{point['time']}:00"
+    urls_folder = os.path.join(archive_folder, "urls")
+    for dir_path, _, file_names in sorted(os.walk(urls_folder)):
+        for file_name in sorted(file_names):
+            try:
+                with open(os.path.join(dir_path, file_name), "r") as file:
+                    url = json.load(file)["url"]
+            except (OSError, KeyError, json.JSONDecodeError):
+                continue
+            if "name=YearBasin-" in url:
+                continue
+            page = load_archived_page(url, archive_folder)
+            if page is None:
+                continue
+            typhoon_name, fourth_table_data = parse_storm_page(page.text)
+            if not typhoon_name or not fourth_table_data:
+                continue
+            for row in add_missing_dates_and_empty_cells(fourth_table_data):
+                if isinstance(row[1], str):
+                    yield url, row[1]
+
+def check_track_times(folder_path="data", archive_folder=None):
+    # Compares parse_track_time with strptime/strftime/timegm on every cached and archived track row
+    # and prints the rows where they differ. Returns the number of mismatches.
+    archive_folder = archive_folder or PAGE_ARCHIVE_FOLDER or os.path.join(folder_path, "raw")
+    checked = 0
+    mismatches = []
+    for source, text in iter_track_time_texts(folder_path, archive_folder):
+        checked += 1
+        parsed, expected = parse_track_time(text), strptime_track_time(text)
+        if parsed != expected:
+            mismatches.append((source, text, parsed, expected))
+    for source, text, parsed, expected in mismatches[:20]:
+        print(f"Mismatch in {source}: {text!r} parsed as {parsed}, strptime gives {expected}")
+    print(f"Checked {checked} track times from {folder_path} and {archive_folder}: {len(mismatches)} mismatches.")
+    return len(mismatches)
+
+def normalize_track_python(fourth_table_data, month=None):
+    # Row-at-a-time reference implementation, used when numpy is missing or the table is ragged.
+    # Returns the path, the filled-in time of the first row and the last parseable time.
+    processed_data = add_missing_dates_and_empty_cells(fourth_table_data)
+    path = []
+    for row in processed_data:
+        time = row[1]
+        if time:
+            parsed = parse_track_time(time)
+            if parsed:
+                if month and parsed[2] != int(month):
+                    continue  # Skip rows outside the requested month
+                time = parsed[0]
+        lat = row[3] if row[3] != "N / A" else None
+        long = row[4] if row[4] != "N / A" else None
+        speed = row[5] if row[5] != "N / A" else None
+        pressure = row[6] if row[6] != "N / A" else None
+        if speed:
+            speed = int(speed)
+            typhoon_class = bisect_right(CLASS_SPEED_BOUNDS, speed)
+        else:
+            typhoon_class = 0
+        path.append({
+            "time": time,
+            "lat": float(lat) if lat else None,
+            "long": float(long) if long else None,
+            "speed": str(speed) if speed else "< 35",
+            "pressure": str(pressure) if pressure else "> 1008",
+            "class": typhoon_class
+        })
+    last_time = None
+    for row in reversed(processed_data):
+        try:
+            parsed = parse_track_time(row[1])
+        except TypeError:
+            continue
+        if parsed:
+            last_time = TRACK_EPOCH + timedelta(seconds=parsed[1])
+            break
+    return path, processed_data[0][1], last_time
+
+def fill_column(values):
+    # Blank cells repeat the cell above ("N / A" counts as a value and becomes None); blanks at the top are None.
+    values = np.array(values, dtype=object)
+    filled = values != ""
+    source = np.maximum.accumulate(np.where(filled, np.arange(len(values)), -1))
+    result = np.where(source >= 0, values[np.maximum(source, 0)], None)
+    result[result == "N / A"] = None
+    return result
+
+def fill_times(times):
+    # A cell holding only a clock time takes the date of the latest cell that has one, like
+    # add_missing_dates_and_empty_cells; whatever is still blank then repeats the cell above.
+    times = np.array(times)
+    has_date = np.char.find(times, " ") >= 0
+    dated_rows = np.flatnonzero(has_date)
+    if len(dated_rows):
+        dates = np.array([time.split()[0] for time in times[dated_rows].tolist()])
+        latest = np.searchsorted(dated_rows, np.arange(len(times)), side="right") - 1
+        undated = ~has_date & (latest >= 0)
+        times = times.astype(object)
+        times[undated] = np.char.add(np.char.add(dates[latest[undated]], " "), times[undated].astype(str))
+    return fill_column(times)
+
+def track_time_fields(text, seconds=True):
+    # Reads "YYYY-MM-DD HH:MM:SS" (or "YYYY-MM-DD HH:MM" with seconds=False) from the code points of a
+    # fixed-width string array. Returns a mask of the texts in that zero-padded layout holding a real
+    # date and time, and their [year, month, day, hour, minute, second] (second is 0 without seconds).
+    width = 19 if seconds else 16
+    count = len(text)
+    fields = np.zeros((count, 6), dtype=np.int64)
+    if count == 0 or text.dtype.kind != "U" or text.dtype.itemsize < width * 4:
+        return np.zeros(count, dtype=bool), fields
+    codes = text.view(np.uint32).reshape(count, -1)[:, :width].astype(np.int64)
+    digits = codes - 48
+    digit_columns = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15] + ([17, 18] if seconds else [])
+    valid = (np.char.str_len(text) == width) & np.all((digits[:, digit_columns] >= 0) & (digits[:, digit_columns] <= 9), axis=1)
+    valid &= (codes[:, 4] == 45) & (codes[:, 7] == 45) & (codes[:, 10] == 32) & (codes[:, 13] == 58)
+    fields[:, 0] = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    for column, start in ((1, 5), (2, 8), (3, 11), (4, 14)):
+        fields[:, column] = digits[:, start] * 10 + digits[:, start + 1]
+    if seconds:
+        valid &= codes[:, 16] == 58
+        fields[:, 5] = digits[:, 17] * 10 + digits[:, 18]
+    year, month = fields[:, 0], fields[:, 1]
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = np.array(DAYS_IN_MONTH)[np.clip(month, 0, 12)] + ((month == 2) & leap)
+    # Years before 1000 are left to strptime/strftime, which don't zero-pad them.
+    valid &= (year >= 1000) & (month >= 1) & (month <= 12) & (fields[:, 2] >= 1) & (fields[:, 2] <= month_days)
+    valid &= (fields[:, 3] < 24) & (fields[:, 4] < 60) & (fields[:, 5] < 60)
+    return valid, fields
+
+def track_days(valid, fields):
+    # Days since 1970-01-01 of the dates in track_time_fields output; 0 where valid is False.
+    months = np.where(valid, (fields[:, 0] - 1970) * 12 + fields[:, 1] - 1, 0)
+    return months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) + np.where(valid, fields[:, 2] - 1, 0)
+
+def parse_track_times(times):
+    # Vectorized strptime("%Y-%m-%d %H:%M:%S") for the usual zero-padded layout. Anything else goes
+    # through parse_track_time so the results match it.
+    text = np.array([time if isinstance(time, str) else "" for time in times])
+    valid, fields = track_time_fields(text)
+    display = np.where(valid, text.astype("U16"), None).astype(object)
+    for index in np.flatnonzero(~valid & (text != "")):
+        parsed = parse_track_time(times[index])
+        if parsed is None:
+            continue
+        valid[index] = True
+        fields[index] = (TRACK_EPOCH + timedelta(seconds=parsed[1])).timetuple()[:6]
+        display[index] = parsed[0]
+    return valid, fields, display
+
+def normalize_track_numpy(fourth_table_data, month=None):
+    # Same output as normalize_track_python, computed a column at a time.
+    columns = list(zip(*fourth_table_data))
+    columns = [["N / A" if not cell else cell for cell in column[:1]] + list(column[1:]) for column in columns]
+    times = fill_times(columns[1])
+    lats, longs, speeds, pressures = (fill_column(columns[index]) for index in (3, 4, 5, 6))
+    valid, fields, display = parse_track_times(times.tolist())
+    keep = ~valid | (not month) | (fields[:, 1] == int(month if month else 0))
+    raw_times = times.tolist()
+    path_times = [shown if ok else raw for shown, ok, raw in zip(display.tolist(), valid.tolist(), raw_times)]
+    has_speed = speeds != None
+    speed_values = np.zeros(len(speeds), dtype=np.int64)
+    speed_values[has_speed] = list(map(int, speeds[has_speed]))
+    classes = np.where(has_speed, np.searchsorted(CLASS_SPEED_BOUNDS, speed_values, side="right"), 0)
+    speed_text = np.where(has_speed & (speed_values != 0), speed_values.astype(str).astype(object), "< 35")
+    pressure_text = np.where(pressures != None, pressures, "> 1008")
+    lat_values = [float(lat) if lat else None for lat in lats.tolist()]
+    long_values = [float(long) if long else None for long in longs.tolist()]
+    path = [{"time": time, "lat": lat, "long": long, "speed": speed, "pressure": pressure, "class": typhoon_class}
+            for time, lat, long, speed, pressure, typhoon_class, kept
+            in zip(path_times, lat_values, long_values, speed_text.tolist(), pressure_text.tolist(), classes.tolist(), keep.tolist())
+            if kept]
+    last_time = None
+    if valid.any():
+        last_time = datetime(*fields[np.flatnonzero(valid)[-1]].tolist())
+    return path, raw_times[0], last_time
+
+# Thresholds (knots) of script.js getCategoryKey, in the order of CATEGORY_KEYS.
+CATEGORY_BOUNDS = [34, 64, 83, 96, 113, 137]
+CATEGORY_KEYS = ["td", "ts", "c1", "c2", "c3", "c4", "c5"]
+
+def storm_summary(path):
+    # Facts the visualizer and dashboards otherwise derive from the path: first/last time (epoch ms),
+    # peak reported speed, lowest reported pressure ("< 35" / "> 1008" don't count), the categories
+    # script.js draws (by first appearance in time) and the [min_lat, min_long, max_lat, max_long] box.
+    if np is None or not path:
+        return storm_summary_python(path)
+    times = [point.get("time") for point in path]
+    valid, fields, _ = parse_track_times([f"{time}:00" if isinstance(time, str) else None for time in times])
+    epochs = np.where(valid, track_days(valid, fields) * 86400 + fields[:, 3] * 3600 + fields[:, 4] * 60, 0)
+    for index in np.flatnonzero(~valid):
+        time_obj = point_time(path[index])
+        if time_obj is not None:
+            valid[index] = True
+            epochs[index] = calendar.timegm(time_obj.timetuple())
+    speed_values, speed_reported = reading_columns([point.get("speed") for point in path], "< 35")
+    pressure_values, pressure_reported = reading_columns([point.get("pressure") for point in path], "> 1008")
+    order = np.lexsort((np.where(valid, epochs, 0), ~valid))
+    lats = np.array([point.get("lat") for point in path], dtype=float)
+    longs = np.array([point.get("long") for point in path], dtype=float)
+    located = ~np.isnan(lats) & ~np.isnan(longs)
+    return {
+        "first_timestamp": int(epochs[valid].min()) * 1000 if valid.any() else None,
+        "last_timestamp": int(epochs[valid].max()) * 1000 if valid.any() else None,
+        "peak_speed": int(speed_values[speed_reported].max()) if speed_reported.any() else None,
+        "min_pressure": int(pressure_values[pressure_reported].min()) if pressure_reported.any() else None,
+        "categories": categories_in_order(speed_values[order].tolist()),
+        "bbox": [float(lats[located].min()), float(longs[located].min()), float(lats[located].max()), float(longs[located].max())] if located.any() else None,
+    }
+
+def decode_reading(reading, sentinel_text):
+    # The value script.js reads (reading_value) and whether the reading was actually reported: not
+    # missing, not the "< 35" / "> 1008" sentinel, and holding digits that make a whole number.
+    value = reading_value(reading)
+    return value, reading is not None and reading != sentinel_text and isinstance(value, int) and bool(re.search(r"[0-9]", str(reading)))
+
+def categories_in_order(speeds):
+    # The CATEGORY_KEYS of speeds given in time order, each listed once where it first appears.
+    categories = []
+    for speed in speeds:
+        category = CATEGORY_KEYS[bisect_right(CATEGORY_BOUNDS, speed)]
+        if category not in categories:
+            categories.append(category)
+    return categories
+
+def reading_columns(readings, sentinel_text):
+    # decode_reading over a column, once per distinct string, since a season only has a few hundred.
+    decoded = {}
+    for reading in readings:
+        if reading not in decoded:
+            decoded[reading] = decode_reading(reading, sentinel_text)
+    values = np.array([decoded[reading][0] for reading in readings], dtype=np.int64)
+    reported = np.array([decoded[reading][1] for reading in readings], dtype=bool)
+    return values, reported
+
+def storm_summary_python(path):
+    timed, lats, longs, speeds, pressures = [], [], [], [], []
+    for point in path:
+        time = point.get("time")
+        epoch = encode_display_time(time)
+        if epoch is None and point_time(point) is not None:
+            epoch = calendar.timegm(point_time(point).timetuple())
+        speed, speed_reported = decode_reading(point.get("speed"), "< 35")
+        pressure, pressure_reported = decode_reading(point.get("pressure"), "> 1008")
+        timed.append((epoch is None, epoch or 0, len(timed), speed))
+        if speed_reported:
+            speeds.append(speed)
+        if pressure_reported:
+            pressures.append(pressure)
+        if point.get("lat") is not None and point.get("long") is not None:
+            lats.append(point["lat"])
+            longs.append(point["long"])
+    epochs = [epoch for missing, epoch, _, _ in timed if not missing]
+    return {
+        "first_timestamp": min(epochs) * 1000 if epochs else None,
+        "last_timestamp": max(epochs) * 1000 if epochs else None,
+        "peak_speed": max(speeds) if speeds else None,
+        "min_pressure": min(pressures) if pressures else None,
+        "categories": categories_in_order(speed for _, _, _, speed in sorted(timed)),
+        "bbox": [min(lats), min(longs), max(lats), max(longs)] if lats else None,
+    }
+
+def build_typhoon_data(typhoon_name, fourth_table_data, month=None, link=None):
+    composite_name = typhoon_name.split()
+    if len(composite_name) >= 2:
+        typhoon_name = composite_name[-2]
+    else:
+        typhoon_name = "UNKNOWN"
+    if not fourth_table_data:
+        return None
+    if np is not None and len({len(row) for row in fourth_table_data}) == 1 and len(fourth_table_data[0]) >= 7:
+        path, first_time, last_time = normalize_track_numpy(fourth_table_data, month)
+    else:
+        path, first_time, last_time = normalize_track_python(fourth_table_data, month)
+    typhoon_data = {"name": typhoon_name, "path": path}
+    parsed = parse_track_time(first_time)
+    if parsed:
+        # start_time keeps its original meaning: the first row's minute read as local time.
+        start_time = TRACK_EPOCH + timedelta(seconds=parsed[1] - parsed[1] % 60)
+        typhoon_data["start_time"] = int(start_time.timestamp())
+    else:
+        typhoon_data["start_time"] = None
+    if link:
+        typhoon_data["id"] = storm_id_from_link(link)
+    typhoon_data["active"] = is_storm_active(last_time) if last_time else False
+    typhoon_data["summary"] = storm_summary(path)
+    return typhoon_data
+
+def scrape_typhoon(link, per_host_limit=PER_HOST_LIMIT, session=None, request_counts=None):
+    typhoon_name, fourth_table_data = scrape_storm_page(link, per_host_limit, session, request_counts)
+    if not typhoon_name:
+        return None
+    return build_typhoon_data(typhoon_name, fourth_table_data, link=link)
+
+def imap_links(func, links, workers=1):
+    if workers <= 1:
+        yield from map(func, links)
+        return
+    # executor.map yields results in submission order, so the output keeps the links table order.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, links)
+
+def map_links(func, links, workers=1):
+    return list(imap_links(func, links, workers))
+
+def scrape_typhoons(links, workers=1, per_host_limit=PER_HOST_LIMIT, session=None, request_counts=None):
+    scrape = partial(scrape_typhoon, per_host_limit=per_host_limit, session=session, request_counts=request_counts)
+    return [typhoon_data for typhoon_data in map_links(scrape, links, workers) if typhoon_data]
+
+async def scrape_typhoon_async(session, link, semaphore, request_counts=None):
+    status, html = await fetch_page_async(session, link, semaphore, request_counts)
+    if status != 200:
+        print(f"Failed to retrieve page: {status}")
+        return None
+    typhoon_name, fourth_table_data = parse_storm_page(html)
+    if not typhoon_name:
+        return None
+    return build_typhoon_data(typhoon_name, fourth_table_data, link=link)
+
+def point_time(point):
+    try:
+        return datetime.strptime(point["time"], "%Y-%m-%d %H:%M")
+    except (TypeError, ValueError):
+        return None
+
+def filter_points(data, keep):
+    # Like the old scrape-time month filter, points without a parseable time are kept
+    # and every storm stays in the list, even if its path ends up empty.
+    filtered_data = []
+    for typhoon_data in data:
+        path = [point for point in typhoon_data["path"] if point_time(point) is None or keep(point_time(point))]
+        filtered_typhoon = {**typhoon_data, "path": path}
+        if "summary" in typhoon_data:
+            filtered_typhoon["summary"] = storm_summary(path)
+        filtered_data.append(filtered_typhoon)
+    return filtered_data
+
+def filter_by_time_window(data, start=None, end=None):
+    if data is None or (start is None and end is None):
+        return data
+    return filter_points(data, lambda time: (start is None or time >= start) and (end is None or time < end))
+
+def filter_by_month(data, month=None):
+    if data is None or not month:
+        return data
+    return filter_points(data, lambda time: time.month == int(month))
+
+def warn_repeated_requests(request_counts):
+    repeated = [url for url, count in request_counts.items() if count > 1]
+    if repeated:
+        print(f"Warning: {len(repeated)} pages were requested more than once: {repeated}")
+
+def save_data_as_json(year, basin_name, month=None, folder_path="data", workers=1, per_host_limit=PER_HOST_LIMIT, session=None, lazy=False,
+                      request_counts=None):
+    # Pass a Counter as request_counts to see how often each URL was requested in this run.
+    request_counts = Counter() if request_counts is None else request_counts
+    links_by_basin = extract_links_from_second_table(fetch_year_page(year, per_host_limit, session, request_counts))
     if not links_by_basin:
         return None
     if basin_name not in links_by_basin:
         print(f"Basin '{basin_name}' not found. Available basins: {list(links_by_basin.keys())}")
         return None
+    if STREAM_CACHE_WRITES and CACHE_FORMAT == "json":
+        return stream_season(year, basin_name, links_by_basin[basin_name], month, folder_path, workers, per_host_limit, session, lazy,
+                             request_counts)
+    all_typhoon_data = scrape_typhoons(links_by_basin[basin_name], workers, per_host_limit, session, request_counts)
+    warn_repeated_requests(request_counts)
+    # The cache always holds the full year; the month filter is applied to what we hand back.
+    save_cache(all_typhoon_data, year, basin_name, folder_path)
+    return filter_by_month(all_typhoon_data, month)
+
+def stream_season(year, basin_name, links, month=None, folder_path="data", workers=1, per_host_limit=PER_HOST_LIMIT, session=None, lazy=False,
+                  request_counts=None):
+    # Each storm goes to disk as soon as it is scraped, so scraping doesn't hold the season in memory. The
+    # return value still does unless lazy=True: that is the only mode where memory stays flat end to end.
+    # Storms recovered from an interrupted run are kept and their pages not fetched again; a storm
+    # that failed last time is retried and lands after them.
+    writer = SeasonStreamWriter(year, basin_name, folder_path)
+    request_counts = Counter() if request_counts is None else request_counts
+    scrape = partial(scrape_typhoon, per_host_limit=per_host_limit, session=session, request_counts=request_counts)
+    links = [link for link in links if storm_id_from_link(link) not in writer.recovered_ids]
+    for typhoon_data in imap_links(scrape, links, workers):
+        if typhoon_data:
+            writer.write(typhoon_data)
+    writer.close()
+    warn_repeated_requests(request_counts)
+    # Callers get the same list of dicts as from the in-memory path. lazy=True opts into StormHandles
+    # for the whole year, which read one storm from disk at a time; a month filter always gives dicts.
+    if lazy and not month:
+        return load_storm_headers(year, basin_name, folder_path, "json")
+    return filter_by_month(load_json_cache(writer.cache_file), month)
+
+def scrape_year_all_basins(year, basins=None, month=None, folder_path="data", workers=1, per_host_limit=PER_HOST_LIMIT, session=None,
+                           request_counts=None):
+    request_counts = Counter() if request_counts is None else request_counts
+    links_by_basin = extract_links_from_second_table(fetch_year_page(year, per_host_limit, session, request_counts))
+    if not links_by_basin:
+        return None
+    if basins is None:
+        basins = list(BASIN_ABBREVIATIONS)
+    missing = [basin_name for basin_name in basins if basin_name not in links_by_basin]
+    if missing:
+        print(f"Basins {missing} not found. Available basins: {list(links_by_basin.keys())}")
+    basins = [basin_name for basin_name in basins if basin_name in links_by_basin]
+    # Scrape every basin's storms in one batch so the worker pool stays busy across basin boundaries.
+    all_links = [link for basin_name in basins for link in links_by_basin[basin_name]]
+    scrape = partial(scrape_typhoon, per_host_limit=per_host_limit, session=session, request_counts=request_counts)
+    results = map_links(scrape, all_links, workers)
+    warn_repeated_requests(request_counts)
+    data_by_basin = {}
+    start = 0
+    for basin_name in basins:
+        end = start + len(links_by_basin[basin_name])
+        all_typhoon_data = [typhoon_data for typhoon_data in results[start:end] if typhoon_data]
+        save_cache(all_typhoon_data, year, basin_name, folder_path)
+        data_by_basin[basin_name] = filter_by_month(all_typhoon_data, month)
+        start = end
+    return data_by_basin
+
+def refresh_season(year, basin_name, folder_path="data", workers=1, per_host_limit=PER_HOST_LIMIT, session=None, request_counts=None):
+    request_counts = Counter() if request_counts is None else request_counts
+    cached_data = load_cache(year, basin_name, folder_path)
+    if not cached_data:
+        return save_data_as_json(year, basin_name, None, folder_path, workers, per_host_limit, session, request_counts=request_counts)
+    links_by_basin = extract_links_from_second_table(fetch_year_page(year, per_host_limit, session, request_counts))
+    if not links_by_basin:
+        return None
+    if basin_name not in links_by_basin:
+        print(f"Basin '{basin_name}' not found. Available basins: {list(links_by_basin.keys())}")
+        return None
+    cached_by_id = {typhoon_data["id"]: typhoon_data for typhoon_data in cached_data if typhoon_data.get("id")}
+    links = links_by_basin[basin_name]
+    stale_links = [link for link in links
+                   if storm_id_from_link(link) not in cached_by_id or cached_by_id[storm_id_from_link(link)].get("active")]
+    print(f"Refreshing {len(stale_links)} of {len(links)} storms for {basin_name} in {year}.")
+    scrape = partial(scrape_typhoon, per_host_limit=per_host_limit, session=session, request_counts=request_counts)
+    fresh_by_id = {storm_id_from_link(link): typhoon_data
+                   for link, typhoon_data in zip(stale_links, map_links(scrape, stale_links, workers)) if typhoon_data}
+    warn_repeated_requests(request_counts)
+    # Keep the links table order; a storm whose page failed to load keeps its cached entry.
     all_typhoon_data = []
-    for link in links_by_basin[basin_name]:
-        typhoon_name = get_typhoon_name_from_link(link)
-        if not typhoon_name:
-            continue
-        composite_name = typhoon_name.split()
-        if len(composite_name) >= 2:
-            typhoon_name = composite_name[-2]
-        else:
-            typhoon_name = "UNKNOWN"
-        fourth_table_data = scrape_fourth_table(link)
-        if not fourth_table_data:
-            continue
-        processed_data = add_missing_dates_and_empty_cells(fourth_table_data)
-        typhoon_data = {"name": typhoon_name, "path": []}
-        for row in processed_data:
-            time = row[1]
-            if time:
-                try:
-                    time_obj = datetime.strptime(time, "%Y-%m-%d %H:%M:%S")
-                    if month and time_obj.month != int(month):
-                        continue  # Skip rows outside the requested month
-                    time = time_obj.strftime("%Y-%m-%d %H:%M")
-                except ValueError:
-                    pass
-            lat = row[3] if row[3] != "N / A" else None
-            long = row[4] if row[4] != "N / A" else None
-            speed = row[5] if row[5] != "N / A" else None
-            pressure = row[6] if row[6] != "N / A" else None
-            if speed:
-                speed = int(speed)
-                if speed < 34:
-                    typhoon_class = 0
-                elif 34 <= speed <= 63:
-                    typhoon_class = 1
-                elif 64 <= speed <= 82:
-                    typhoon_class = 2
-                elif 83 <= speed <= 95:
-                    typhoon_class = 3
-                elif 96 <= speed <= 112:
-                    typhoon_class = 4
-                elif speed >= 113:
-                    typhoon_class = 5
-            else:
-                typhoon_class = 0
-            typhoon_data["path"].append({
-                "time": time,
-                "lat": float(lat) if lat else None,
-                "long": float(long) if long else None,
-                "speed": str(speed) if speed else "< 35",
-                "pressure": str(pressure) if pressure else "> 1008",
-                "class": typhoon_class
-            })
-        if processed_data:
-            try:
-                start_time = datetime.strptime(processed_data[0][1], "%Y-%m-%d %H:%M:%S")
-                start_time = start_time.replace(second=0)
-                typhoon_data["start_time"] = int(start_time.timestamp())
-            except ValueError:
-                typhoon_data["start_time"] = None
-        all_typhoon_data.append(typhoon_data)
+    for link in links:
+        typhoon_data = fresh_by_id.get(storm_id_from_link(link)) or cached_by_id.get(storm_id_from_link(link))
+        if typhoon_data:
+            all_typhoon_data.append(typhoon_data)
     save_cache(all_typhoon_data, year, basin_name, folder_path)
     return all_typhoon_data
 
-def scrape_typhoon_data(year, basin_name, month=None, folder_path="data"):
-    data = load_cache(year, basin_name, folder_path)
-    if data:
-        return data
-    else:
+def scrape_typhoon_data(year, basin_name, month=None, folder_path="data", workers=1, per_host_limit=PER_HOST_LIMIT, session=None, refresh=False):
+    if not refresh and is_cache_expired(year, basin_name, folder_path):
+        # An open season past its TTL is refreshed rather than served stale; closed storms stay cached.
+        with _counters_lock:
+            CACHE_STATS["expired"] += 1
+        print(f"Cache for {basin_name} in {year} is older than {OPEN_SEASON_TTL_HOURS} hours. Refreshing.")
+        refresh = True
+    seen = cache_signature(year, basin_name, folder_path)
+    if not refresh:
+        data = load_cache(year, basin_name, folder_path)
+        if data:
+            return filter_by_month(data, month)
+    # Single flight: one process scrapes the season while the others wait and then read its result.
+    with file_lock(lock_file_path(folder_path, season_key(year, basin_name))):
+        if cache_signature(year, basin_name, folder_path) not in (seen, None):
+            print(f"{basin_name} {year} was written by another worker while waiting.")
+            data = load_cache(year, basin_name, folder_path)
+            if data:
+                return filter_by_month(data, month)
+        if refresh:
+            return filter_by_month(refresh_season(year, basin_name, folder_path, workers, per_host_limit, session), month)
         print(f"Cache not found. Scraping data for {basin_name} in {year}.")
-        return save_data_as_json(year, basin_name, month, folder_path)
+        return save_data_as_json(year, basin_name, month, folder_path, workers, per_host_limit, session)
 
-if __name__ == "__main__":
+def cache_signature(year, basin_name, folder_path="data"):
+    cache_file, _ = find_cache_file(year, basin_name, folder_path)
+    if cache_file is None:
+        return None
+    stat = os.stat(cache_file)
+    return cache_file, stat.st_mtime_ns, stat.st_size
+
+async def save_data_as_json_async(session, year, basin_name, semaphore, month=None, folder_path="data", request_counts=None):
+    request_counts = Counter() if request_counts is None else request_counts
+    html = await fetch_year_page_async(session, year, semaphore, request_counts)
+    if not html:
+        return None
+    links_by_basin = extract_links_from_second_table(html)
+    if not links_by_basin:
+        return None
+    if basin_name not in links_by_basin:
+        print(f"Basin '{basin_name}' not found. Available basins: {list(links_by_basin.keys())}")
+        return None
+    results = await asyncio.gather(*(scrape_typhoon_async(session, link, semaphore, request_counts) for link in links_by_basin[basin_name]))
+    warn_repeated_requests(request_counts)
+    all_typhoon_data = [typhoon_data for typhoon_data in results if typhoon_data]
+    # Encoding and writing a season takes long enough to stall other scrapes, so it runs in a thread.
+    await asyncio.get_running_loop().run_in_executor(None, save_cache, all_typhoon_data, year, basin_name, folder_path)
+    return filter_by_month(all_typhoon_data, month)
+
+# Pass a shared session and semaphore to scrape many year/basin pairs from one event loop
+# while keeping the total number of requests in flight bounded.
+async def scrape_typhoon_data_async(year, basin_name, month=None, folder_path="data", session=None, semaphore=None, concurrency=PER_HOST_LIMIT, refresh=False):
+    # Cache reads, writes and the season lock all run in threads so they don't block the event loop.
+    loop = asyncio.get_running_loop()
+    if not refresh and is_cache_expired(year, basin_name, folder_path):
+        with _counters_lock:
+            CACHE_STATS["expired"] += 1
+        print(f"Cache for {basin_name} in {year} is older than {OPEN_SEASON_TTL_HOURS} hours. Refreshing.")
+        refresh = True
+    seen = cache_signature(year, basin_name, folder_path)
+    if not refresh:
+        data = await loop.run_in_executor(None, load_cache, year, basin_name, folder_path)
+        if data:
+            return filter_by_month(data, month)
+    if aiohttp is None and not refresh:
+        print("aiohttp is not installed. Install it with 'pip install aiohttp' to use the async scraper.")
+        return None
+    lock_fd = await loop.run_in_executor(None, acquire_file_lock, lock_file_path(folder_path, season_key(year, basin_name)))
+    try:
+        if cache_signature(year, basin_name, folder_path) not in (seen, None):
+            print(f"{basin_name} {year} was written by another worker while waiting.")
+            data = await loop.run_in_executor(None, load_cache, year, basin_name, folder_path)
+            if data:
+                return filter_by_month(data, month)
+        if refresh:
+            # Only the open storms are fetched again, through the same blocking path scrape_typhoon_data uses.
+            return filter_by_month(await loop.run_in_executor(None, refresh_season, year, basin_name, folder_path), month)
+        print(f"Cache not found. Scraping data for {basin_name} in {year}.")
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(concurrency)
+        if session is not None:
+            return await save_data_as_json_async(session, year, basin_name, semaphore, month, folder_path)
+        async with aiohttp.ClientSession() as session:
+            return await save_data_as_json_async(session, year, basin_name, semaphore, month, folder_path)
+    finally:
+        release_file_lock(lock_fd)
+
+def reprocess_season(task):
+    # Runs in a worker process: rebuilds one basin-year from archived storm pages only.
+    year, basin_name, links, archive_folder = task
+    all_typhoon_data = []
+    for link in links:
+        page = load_archived_page(link, archive_folder)
+        if page is None:
+            print(f"Page not in archive, skipping: {link}")
+            continue
+        typhoon_name, fourth_table_data = parse_storm_page(page.text)
+        if typhoon_name:
+            typhoon_data = build_typhoon_data(typhoon_name, fourth_table_data, link=link)
+            if typhoon_data:
+                all_typhoon_data.append(typhoon_data)
+    return year, basin_name, all_typhoon_data
+
+def reprocess_archive(folder_path="data", archive_folder=None, years=None, workers=None):
+    archive_folder = archive_folder or PAGE_ARCHIVE_FOLDER or os.path.join(folder_path, "raw")
+    if years is None:
+        years = range(FIRST_SEASON_YEAR, datetime.now().year + 2)
+    tasks = []
+    for year in years:
+        page = load_archived_page(year_page_url(year), archive_folder)
+        if page is None:
+            continue
+        links_by_basin = extract_links_from_second_table(page.text)
+        for basin_name, links in (links_by_basin or {}).items():
+            if basin_name in BASIN_ABBREVIATIONS:
+                tasks.append((year, basin_name, links, archive_folder))
+    if not tasks:
+        print(f"No archived year pages found in {archive_folder}.")
+        return 0
+    # Parsing is CPU bound, so seasons are spread over processes; caches are written from this process.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for year, basin_name, all_typhoon_data in executor.map(reprocess_season, tasks):
+            save_cache(all_typhoon_data, year, basin_name, folder_path)
+    return len(tasks)
+
+def main():
     year = input("Enter year (e.g., 2025): ").strip()
     month = input("Enter month (1-12, optional, press Enter to skip): ").strip() or None
     basin = input("Enter basin (e.g., Western Pacific): ").strip()
     data = scrape_typhoon_data(year, basin, month)
     if data:
         print(f"Fetched and cached {len(data)} typhoons.")
+        stats = connection_stats()
+        if stats["requests"]:
+            print(f"HTTP: {stats['requests']} requests over {stats['connections']} connections ({stats['reused']} reused).")
+        if cache_report():
+            print(cache_report())
     else:
         print("No data available.")
+
+if __name__ == "__main__":
+    # python PythonScript.py consolidate [folder]  packs the cache folder into a memory-mapped archive.
+    # python PythonScript.py reprocess [folder]    rebuilds the cache folder from the raw page archive in [folder]/raw.
+    # python PythonScript.py index [folder]        rebuilds the cross-year storm index of [folder].
+    # python PythonScript.py check-times [folder]  compares parse_track_time with strptime on every cached and archived row.
+    if len(sys.argv) > 1 and sys.argv[1] == "index":
+        build_storm_index(sys.argv[2] if len(sys.argv) > 2 else "data")
+    elif len(sys.argv) > 1 and sys.argv[1] == "reprocess":
+        reprocess_archive(sys.argv[2] if len(sys.argv) > 2 else "data")
+    elif len(sys.argv) > 1 and sys.argv[1] == "check-times":
+        sys.exit(1 if check_track_times(sys.argv[2] if len(sys.argv) > 2 else "data") else 0)
+    elif len(sys.argv) > 1 and sys.argv[1] == "consolidate":
+        if np is None:
+            print("numpy is not installed. Install it with 'pip install numpy' to build the track archive.")
+        else:
+            build_track_archive(sys.argv[2] if len(sys.argv) > 2 else "data")
+    else:
+        main()
@@ -0,0 +1,245 @@
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import random
+import tempfile
+import contextlib
+import multiprocessing
+
+import PythonScript
+from bs4 import BeautifulSoup
+from fixture_site import BASINS, build_site, point_scraper_at, serve, track_rows
+
+# Benchmarks for PythonScript.py against generated fixtures and a local stand-in server, using only the
+# standard library on top of the scraper's own dependencies. Run `python bench.py <name>`, or
+# `python bench.py` for all of them:
+#   fetch   sequential vs. thread-pool storm page fetching with fake network latency
+#   async   thread-pool vs. asyncio scraping of the same season, checking the cache files match byte for byte
+#   parse   parse time per storm page for each installed HTML parser backend
+#   formats file size of each installed cache format on a multi-decade dataset, with the time to load it
+#           back as dicts (load_cache) and as Storm objects (load_storms)
+#   codecs  compression ratio and decode throughput of the compressed JSON caches
+#   normalize  NumPy vs. row-loop track normalization, alone and in a full archive reprocess
+
+FETCH_LATENCY = 0.5
+ASYNC_LATENCY = 0.05
+PARSE_ROUNDS = 5
+DATASET_YEARS = range(1980, 2025)
+ARCHIVE_YEARS = range(2000, 2012)
+REPROCESS_WORKERS = 4
+
+def quietly(function, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = quietly(function, *args, **kwargs)
+    return time.perf_counter() - start, result
+
+def read_season(year, folder_path, cache_format="json"):
+    contents = {}
+    for basin_name in BASINS:
+        with open(PythonScript.cache_file_path(year, basin_name, folder_path, cache_format), "rb") as file:
+            contents[basin_name] = file.read()
+    return contents
+
+def bench_fetch():
+    pages = build_site([2023])
+    server, stats = serve(pages, latency=FETCH_LATENCY)
+    point_scraper_at(PythonScript, server)
+    print(f"fetch: {len(pages)} pages across {len(BASINS)} basins, {FETCH_LATENCY} s latency per request")
+    outputs = []
+    with tempfile.TemporaryDirectory() as folder_path:
+        for workers, per_host_limit in ((1, 1), (8, 4)):
+            run_folder = os.path.join(folder_path, f"workers{workers}")
+            elapsed, _ = timed(PythonScript.scrape_year_all_basins, 2023, folder_path=run_folder,
+                               workers=workers, per_host_limit=per_host_limit)
+            outputs.append(read_season(2023, run_folder))
+            print(f"  workers={workers} per_host_limit={per_host_limit}: {elapsed:.1f} s")
+    print(f"  output identical: {outputs[0] == outputs[1]}")
+    server.shutdown()
+    server.server_close()
+
+async def scrape_season_async(year, folder_path, concurrency):
+    # All basins share one session and semaphore, the way scrape_typhoon_data_async is meant to be driven.
+    semaphore = asyncio.Semaphore(concurrency)
+    async with PythonScript.aiohttp.ClientSession() as session:
+        await asyncio.gather(*(PythonScript.scrape_typhoon_data_async(year, basin_name, folder_path=folder_path, session=session,
+                                                                      semaphore=semaphore) for basin_name in BASINS))
+
+def bench_async():
+    if PythonScript.aiohttp is None:
+        print("async: aiohttp is not installed, nothing to compare")
+        return
+    pages = build_site([2023])
+    server, stats = serve(pages, latency=ASYNC_LATENCY)
+    point_scraper_at(PythonScript, server)
+    print(f"async: {len(pages)} pages across {len(BASINS)} basins, {ASYNC_LATENCY} s latency per request")
+    outputs = {}
+    with tempfile.TemporaryDirectory() as folder_path:
+        for label in ("threads", "asyncio"):
+            run_folder = os.path.join(folder_path, label)
+            stats.clear()
+            if label == "threads":
+                elapsed, _ = timed(PythonScript.scrape_year_all_basins, 2023, folder_path=run_folder, workers=8, per_host_limit=4)
+            else:
+                elapsed, _ = timed(asyncio.run, scrape_season_async(2023, run_folder, 4))
+            outputs[label] = read_season(2023, run_folder)
+            print(f"  {label + ':':8s} {elapsed:.1f} s, {stats['requests']} requests")
+    print(f"  cache files identical: {outputs['threads'] == outputs['asyncio']}")
+    server.shutdown()
+    server.server_close()
+
+def parse_full_tree(html):
+    # What the scraper did before parser backends: build the whole tree with html.parser.
+    soup = BeautifulSoup(html, "html.parser")
+    return PythonScript.extract_typhoon_name(soup), PythonScript.extract_fourth_table(soup)
+
+def time_per_page(parse, pages):
+    # Best of PARSE_ROUNDS passes over all pages, in milliseconds per page.
+    best = None
+    for _ in range(PARSE_ROUNDS):
+        start = time.perf_counter()
+        for html in pages:
+            parse(html)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(pages) * 1000
+
+def bench_parse():
+    pages = [html for name, html in build_site([2023], points=120).items() if not name.startswith("YearBasin")]
+    print(f"parse: {len(pages)} storm pages of up to 120 track rows, best of {PARSE_ROUNDS} passes")
+    reference = [parse_full_tree(html) for html in pages]
+    print(f"  html.parser, full tree (old): {time_per_page(parse_full_tree, pages):6.2f} ms/page")
+    backends = ["html.parser"]
+    if PythonScript.lxml is not None:
+        backends.append("lxml")
+    if PythonScript.SelectolaxParser is not None:
+        backends.append("selectolax")
+    for backend in backends:
+        same = [quietly(PythonScript.parse_storm_page, html, backend) for html in pages] == reference
+        label = backend if backend == "selectolax" else f"{backend} + SoupStrainer"
+        print(f"  {label + ':':29s} {time_per_page(lambda html: PythonScript.parse_storm_page(html, backend), pages):6.2f} ms/page"
+              f"{'' if same else '  (output differs!)'}")
+
+def build_dataset(years=DATASET_YEARS, seed=3):
+    # {(year, basin): storms} built by build_typhoon_data from generated track tables, without any pages.
+    rng = random.Random(seed)
+    dataset = {}
+    for year in years:
+        for basin_name in BASINS:
+            dataset[(year, basin_name)] = [
+                PythonScript.build_typhoon_data(f"{basin_name} {year} NAME{number} (id)", track_rows(rng, year, rng.randint(30, 120)),
+                                                link=f"index.php?name=v04r01-{year}{number:03d}")
+                for number in range(rng.randint(3, 12))]
+    return dataset
+
+def describe_dataset(dataset):
+    storms = sum(len(data) for data in dataset.values())
+    points = sum(len(typhoon_data["path"]) for data in dataset.values() for typhoon_data in data)
+    return f"{len(dataset)} seasons, {storms} storms, {points} track points"
+
+def save_dataset(dataset, folder_path, cache_format):
+    for (year, basin_name), data in dataset.items():
+        quietly(PythonScript.save_cache, data, year, basin_name, folder_path, cache_format)
+    return sum(os.path.getsize(PythonScript.cache_file_path(year, basin_name, folder_path, cache_format)) for year, basin_name in dataset)
+
+def load_dataset(dataset, folder_path, cache_format, loader=None):
+    loader = loader or PythonScript.load_cache
+    return {(year, basin_name): loader(year, basin_name, folder_path, cache_format, touch=False) for year, basin_name in dataset}
+
+def bench_formats():
+    dataset = build_dataset()
+    print(f"formats: {describe_dataset(dataset)}")
+    expected = json.dumps(list(dataset.values()))
+    with tempfile.TemporaryDirectory() as folder_path:
+        for cache_format in PythonScript.CACHE_FORMATS:
+            if not PythonScript.cache_format_available(cache_format):
+                print(f"  {cache_format:8s} not available")
+                continue
+            size = save_dataset(dataset, folder_path, cache_format)
+            elapsed, loaded = timed(load_dataset, dataset, folder_path, cache_format)
+            storms_elapsed, storms = timed(load_dataset, dataset, folder_path, cache_format, PythonScript.load_storms)
+            lossless = (json.dumps(list(loaded.values())) == expected
+                        and json.dumps([[storm.to_dict() for storm in data] for data in storms.values()]) == expected)
+            print(f"  {cache_format:8s} {size / 1e6:6.1f} MB  dicts {elapsed:.2f} s  storms {storms_elapsed:.2f} s"
+                  f"  {'lossless' if lossless else 'round trip differs!'}")
+
+def bench_codecs():
+    dataset = build_dataset()
+    indented = sum(len(json.dumps(data, indent=4)) for data in dataset.values())
+    compact = sum(len(PythonScript.compact_json_bytes(data)) for data in dataset.values())
+    print(f"codecs: {describe_dataset(dataset)}, {indented / 1e6:.1f} MB as indent=4 JSON, {compact / 1e6:.1f} MB compact")
+    # Throughput is counted in MB of indent=4 JSON loaded per second, so the codecs compare directly.
+    with tempfile.TemporaryDirectory() as folder_path:
+        for cache_format in ("json", "json.gz", "json.zst"):
+            if not PythonScript.cache_format_available(cache_format):
+                print(f"  {cache_format:8s} not available")
+                continue
+            size = save_dataset(dataset, folder_path, cache_format)
+            elapsed = min(timed(load_dataset, dataset, folder_path, cache_format)[0] for _ in range(3))
+            print(f"  {cache_format:8s} {size / 1e6:6.2f} MB  {indented / size:5.1f}x  {indented / 1e6 / elapsed:5.0f} MB/s")
+
+def build_page_archive(pages, archive_folder):
+    # Files the generated pages under the URLs the scraper would have fetched them from.
+    for name, html in pages.items():
+        url = f"{PythonScript.BASE_URL}?name={name}" if name.startswith("YearBasin") else f"{PythonScript.BASE_URL_ALT}index.php?name={name}"
+        PythonScript.archive_page(url, html.encode("utf-8"), "utf-8", archive_folder)
+
+def bench_normalize():
+    if PythonScript.np is None:
+        print("normalize: numpy is not installed, nothing to compare")
+        return
+    numpy = PythonScript.np
+    pages = build_site(ARCHIVE_YEARS, storms_per_basin=25, points=400)
+    tables = [PythonScript.parse_storm_page(html) for name, html in pages.items() if not name.startswith("YearBasin")]
+    print(f"normalize: {len(ARCHIVE_YEARS) * len(BASINS)} seasons, {len(tables)} storms, {sum(len(rows) for _, rows in tables)} track rows")
+    outputs = {}
+    try:
+        for label, module in (("row loop", None), ("numpy", numpy)):
+            PythonScript.np = module
+            # Copied per run because the row loop fills blank cells in place.
+            copies = [(name, [list(row) for row in rows]) for name, rows in tables]
+            elapsed, outputs[label] = timed(lambda: [PythonScript.build_typhoon_data(name, rows) for name, rows in copies])
+            print(f"  build_typhoon_data, {label + ':':9s} {elapsed:5.1f} s")
+        print(f"  output identical: {json.dumps(outputs['row loop']) == json.dumps(outputs['numpy'])}")
+        # Worker processes only see the swapped module when they are forked from this one.
+        if multiprocessing.get_start_method() != "fork":
+            print("  reprocess skipped: worker processes are not forked on this platform")
+            return
+        with tempfile.TemporaryDirectory() as folder_path:
+            archive_folder = os.path.join(folder_path, "raw")
+            build_page_archive(pages, archive_folder)
+            seasons = {}
+            for label, module in (("row loop", None), ("numpy", numpy)):
+                PythonScript.np = module
+                run_folder = os.path.join(folder_path, label.replace(" ", "_"))
+                elapsed, _ = timed(PythonScript.reprocess_archive, run_folder, archive_folder=archive_folder,
+                                   years=ARCHIVE_YEARS, workers=REPROCESS_WORKERS)
+                seasons[label] = [read_season(year, run_folder) for year in ARCHIVE_YEARS]
+                print(f"  reprocess with {REPROCESS_WORKERS} workers, {label + ':':9s} {elapsed:5.1f} s")
+            print(f"  cache files identical: {seasons['row loop'] == seasons['numpy']}")
+    finally:
+        PythonScript.np = numpy
+
+BENCHMARKS = {
+    "fetch": bench_fetch,
+    "async": bench_async,
+    "parse": bench_parse,
+    "formats": bench_formats,
+    "codecs": bench_codecs,
+    "normalize": bench_normalize,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks {unknown}. Available: {list(BENCHMARKS)}")
+        sys.exit(2)
+    for name in names:
+        BENCHMARKS[name]()
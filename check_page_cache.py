@@ -0,0 +1,66 @@
+import io
+import os
+import sys
+import tempfile
+import contextlib
+
+import PythonScript
+from fixture_site import BASINS, build_site, point_scraper_at, serve
+
+# Checks the raw page cache (PAGE_CACHE_FOLDER) against a local server that sends ETags and answers
+# If-None-Match with 304: pages are stored on the first run, reused on a 304, and downloaded again
+# once they change. Run it with `python check_page_cache.py`; it exits non-zero on the first failure.
+
+YEAR = 2023
+
+def scrape_season(folder_path):
+    # Returns the season's cache files, so runs can be compared byte for byte.
+    PythonScript.PAGE_CACHE_STATS.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        PythonScript.scrape_year_all_basins(YEAR, folder_path=folder_path, workers=4)
+    contents = {}
+    for basin_name in BASINS:
+        with open(PythonScript.cache_file_path(YEAR, basin_name, folder_path, "json"), "rb") as file:
+            contents[basin_name] = file.read()
+    return contents
+
+def check(description, condition):
+    print(f"{'ok' if condition else 'FAILED'}: {description}")
+    if not condition:
+        sys.exit(1)
+
+def main():
+    pages = build_site([YEAR])
+    server, stats = serve(pages)
+    point_scraper_at(PythonScript, server)
+    with tempfile.TemporaryDirectory() as folder_path:
+        PythonScript.PAGE_CACHE_FOLDER = os.path.join(folder_path, "pages")
+        PythonScript.CACHE_FORMAT = "json"
+
+        first = scrape_season(os.path.join(folder_path, "run1"))
+        check(f"first run stores all {len(pages)} pages", PythonScript.PAGE_CACHE_STATS["stored"] == len(pages))
+
+        stats.clear()
+        second = scrape_season(os.path.join(folder_path, "run2"))
+        check("second run gets a 304 for every page", stats["not_modified"] == len(pages) and stats["downloaded"] == 0)
+        check("second run reuses every stored page", PythonScript.PAGE_CACHE_STATS["revalidated"] == len(pages))
+        check("output from stored pages is unchanged", second == first)
+
+        changed = sorted(name for name in pages if not name.startswith("YearBasin"))[3]
+        pages[changed] = pages[changed].replace(" (", "-RENAMED (", 1)
+        stats.clear()
+        third = scrape_season(os.path.join(folder_path, "run3"))
+        check("only the changed page is downloaded again", stats["downloaded"] == 1 and stats["not_modified"] == len(pages) - 1)
+        check("the changed page replaces the stored copy", PythonScript.PAGE_CACHE_STATS["stored"] == 1)
+        check("output picks up the change", third != first)
+
+        stats.clear()
+        PythonScript.STREAM_STORM_PAGES = True
+        fourth = scrape_season(os.path.join(folder_path, "run4"))
+        PythonScript.STREAM_STORM_PAGES = False
+        check("the streaming extractor parses stored pages on a 304", stats["downloaded"] == 0 and fourth == third)
+    server.shutdown()
+    server.server_close()
+
+if __name__ == "__main__":
+    main()
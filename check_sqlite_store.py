@@ -0,0 +1,68 @@
+import os
+import sys
+import random
+import tempfile
+
+import PythonScript
+
+# Checks query_points_in_bbox against a brute-force scan over generated track points spread across the
+# whole globe, including boxes that cross the antimeridian, end at +180 or 360, or cover every longitude.
+# Run it with `python check_sqlite_store.py`; it exits non-zero when any box disagrees.
+
+BOXES = [
+    (-90, -180, 90, 180), (-90, 0, 90, 360), (-90, -200, 90, 200),
+    (10, 0, 30, 180), (10, 120, 30, 180), (10, 175, 15, 185), (10, 170, 30, -170),
+    # Both edges in the same grid column, with the box wrapping almost all the way round.
+    (5.6, -166.3, 38.7, -170), (67.4, 3.08, 77.8, 360), (-20, 182, 20, 181), (0, -180, 40, -180.5),
+]
+
+def generate_storms(rng, count):
+    storms = []
+    for number in range(count):
+        path = [{"time": f"2001-0{rng.randint(1, 9)}-1{rng.randint(0, 9)} 00:00",
+                 "lat": round(rng.uniform(-89, 89), 1),
+                 "long": rng.choice([round(rng.uniform(-200, 380), 1), -180.0, 180.0, 0.0, 360.0]),
+                 "speed": "50", "pressure": "990", "class": 1}
+                for _ in range(rng.randint(20, 80))]
+        storms.append({"name": f"S{number}", "id": f"2001{number:03d}", "path": path})
+    return storms
+
+def brute_force(storms, min_lat, min_long, max_lat, max_long):
+    west, span = PythonScript.bbox_longitudes(min_long, max_long)
+    count = 0
+    for typhoon_data in storms:
+        for point in typhoon_data["path"]:
+            if not min_lat <= point["lat"] <= max_lat:
+                continue
+            long = PythonScript.normalize_longitude(point["long"])
+            if span >= 360.0 or west <= long <= west + span or long + 360.0 <= west + span:
+                count += 1
+    return count
+
+def main():
+    rng = random.Random(7)
+    storms = generate_storms(rng, 200)
+    boxes = list(BOXES)
+    for _ in range(300):
+        min_lat = round(rng.uniform(-90, 80), 1)
+        min_long = round(rng.uniform(-200, 380), 2)
+        # Half of the random boxes wrap with both edges close together.
+        max_long = round(min_long - rng.uniform(0, 4), 2) if rng.random() < 0.5 else round(min_long + rng.uniform(0, 200), 2)
+        boxes.append((min_lat, min_long, round(min_lat + rng.uniform(0, 60), 1), max_long))
+    failures = []
+    with tempfile.TemporaryDirectory() as folder_path:
+        db_path = os.path.join(folder_path, "storms.sqlite")
+        PythonScript.save_to_sqlite(storms, 2001, "Western Pacific", db_path)
+        for box in boxes:
+            found = len(PythonScript.query_points_in_bbox(*box, db_path=db_path))
+            expected = brute_force(storms, *box)
+            if found != expected:
+                failures.append((box, found, expected))
+    for box, found, expected in failures:
+        print(f"FAILED: {box} returned {found} points, brute force found {expected}")
+    print(f"{len(boxes) - len(failures)} of {len(boxes)} boxes match the brute-force scan")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
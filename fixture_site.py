@@ -0,0 +1,130 @@
+import random
+import hashlib
+import threading
+import time
+import email.utils
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# A local stand-in for the IBTrACS pages PythonScript.py scrapes, used by check_page_cache.py and bench.py.
+# The pages only carry what the extractors read: the year page's second table.ishade with one column per
+# basin, and storm pages with an <h1> title and the track in the fourth <table>.
+
+BASINS = ["Northern Atlantic", "Eastern Pacific", "Western Pacific", "Northern Indian", "Southern Indian", "Southern Pacific"]
+NAMES = ["MAWAR", "GUCHOL", "TALIM", "DOKSURI", "KHANUN", "LAN", "SAOLA", "DAMREY", "HAIKUI", "KIROGI", "YUN-YEUNG", "KOINU", "BOLAVEN", "SANBA", "JELAWAT"]
+
+def track_rows(rng, year, count):
+    # Rows look like the real table: the date only on the first row of a day, blank and "N / A" cells mixed in.
+    rows = []
+    month, day, hour = rng.randint(1, 11), rng.randint(1, 20), 0
+    for i in range(count):
+        time_text = f"{year}-{month:02d}-{day:02d} {hour:02d}:00:00" if hour == 0 or i == 0 else f"{hour:02d}:00:00"
+        speed = rng.choice(["", "N / A", str(rng.randint(20, 160))]) if i else str(rng.randint(20, 40))
+        pressure = rng.choice(["", str(rng.randint(900, 1010))])
+        lat = f"{rng.uniform(5, 30):.1f}" if rng.random() > 0.05 else ""
+        long = f"{rng.uniform(100, 180):.1f}"
+        rows.append(["WMO", time_text, "TS", lat, long, speed, pressure, "x"])
+        hour += 3
+        if hour >= 24:
+            hour, day = 0, day + 1
+            if day > 28:
+                day, month = 1, month % 12 + 1
+    return rows
+
+def storm_page(storm_id, name, year, rows, filler=2000):
+    table = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>\n" for row in rows)
+    return (f"<html><head><title>{name}</title></head><body><table><tr><td>nav</td></tr></table>"
+            f"<h1>Western Pacific {year} {name} ({storm_id})</h1>"
+            f"<table><tr><td>a</td></tr></table><table><tr><td>b</td></tr></table>"
+            f"<table><tr><th>h1</th></tr><tr><th>h2</th></tr>\n{table}</table>"
+            f"<table><tr><td>after</td></tr></table>" + "<p>filler</p>" * filler + "</body></html>")
+
+def year_page(links_by_basin):
+    rows = "<tr>" + "".join(f"<td>{basin_name}</td>" for basin_name in links_by_basin) + "</tr>"
+    for i in range(max(len(links) for links in links_by_basin.values())):
+        rows += "<tr>" + "".join(f"<td><a href='{links[i]}'>s</a></td>" if i < len(links) else "<td></td>"
+                                 for links in links_by_basin.values()) + "</tr>"
+    return ("<html><body><table class='ishade' summary='Layout table.'><tr><td>x</td></tr></table>"
+            f"<table class='ishade' summary='Layout table.'>{rows}</table></body></html>")
+
+def build_site(years, storms_per_basin=8, points=60, seed=1):
+    # Returns {page name: html}; a page name is the "name" query parameter the scraper asks for.
+    pages = {}
+    for year in years:
+        rng = random.Random(seed * 10000 + year)
+        links_by_basin = {}
+        number = 0
+        for basin_name in BASINS:
+            links_by_basin[basin_name] = []
+            for i in range(storms_per_basin):
+                storm_id = f"{year}{number:03d}N{i:05d}"
+                links_by_basin[basin_name].append(f"index.php?name=v04r01-{storm_id}")
+                rows = track_rows(rng, year, rng.randint(points // 2, points))
+                pages[f"v04r01-{storm_id}"] = storm_page(storm_id, NAMES[number % len(NAMES)], year, rows)
+                number += 1
+        pages[f"YearBasin-{year}"] = year_page(links_by_basin)
+    return pages
+
+def serve(pages, latency=0.0):
+    # Serves `pages` on a free localhost port with ETag / Last-Modified validators, answering a matching
+    # If-None-Match with 304. Edits to `pages` show up on the next request. Every response waits `latency` seconds.
+    stats = Counter()
+    lock = threading.Lock()
+    last_modified = email.utils.formatdate(usegmt=True)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def send_empty(self, status, etag=None):
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_GET(self):
+            time.sleep(latency)
+            name = parse_qs(urlparse(self.path).query).get("name", [""])[0]
+            with lock:
+                stats["requests"] += 1
+            if name not in pages:
+                self.send_empty(404)
+                return
+            body = pages[name].encode("utf-8")
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                with lock:
+                    stats["not_modified"] += 1
+                self.send_empty(304, etag)
+                return
+            with lock:
+                stats["downloaded"] += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+
+        def handle_error(self, request, client_address):
+            pass
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+def point_scraper_at(module, server):
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/ibtracs/"
+    module.BASE_URL = base_url + "index.php"
+    module.BASE_URL_ALT = base_url
@@ -104,8 +104,9 @@ function getDiscColor(key) {
     return m[key]||'#60a5fa';
 }
 function getNeededCategories(storm) {
+    if(storm.summary&&storm.summary.categories) return storm.summary.categories.slice(); // precomputed by the scraper
     const k=new Set();
-    for(const p of storm.path) k.add(getCategoryKey((typeof p.speed==='string')?parseInt(p.speed.replace(/[^0-9]/g,''),10)||0:p.speed));
+    for(const p of storm.path) k.add(getCategoryKey(p.speed));
     return Array.from(k);
 }
 
@@ -228,8 +229,16 @@ function processData(data) {
         if(l.marker?._map)map.removeLayer(l.marker);l.segments?.forEach(s=>map.removeLayer(s));if(l.liveTip?._map)map.removeLayer(l.liveTip)
     });
     Object.keys(stormLayers).forEach(k=>delete stormLayers[k]); activeSVGElements=[];
-    stormsData=data; let minT=Infinity,maxT=-Infinity;
-    stormsData.forEach(s=>{s.path.forEach(p=>{p.timestamp=new Date(p.time.replace(' ','T')+':00Z').getTime();if(p.timestamp<minT)minT=p.timestamp;if(p.timestamp>maxT)maxT=p.timestamp;p.speedVal=(typeof p.speed==='string')?parseInt(p.speed.replace(/[^0-9]/g,''),10)||0:p.speed});s.path.sort((a,b)=>a.timestamp-b.timestamp)});
+    let minT=Infinity,maxT=-Infinity;
+    if(data&&data.version===2){
+        // Schema v2 (*_v2.json): numeric speeds, epoch-ms timestamps and sorted paths, used as is
+        stormsData=data.storms;
+        stormsData.forEach(s=>{if(s.path[0].timestamp<minT)minT=s.path[0].timestamp;if(s.path[s.path.length-1].timestamp>maxT)maxT=s.path[s.path.length-1].timestamp});
+    }else{
+        // Schema v1 (the scraper's cache files): parse times and speeds once into the v2 point shape
+        stormsData=data;
+        stormsData.forEach(s=>{s.path.forEach(p=>{p.timestamp=new Date(p.time.replace(' ','T')+':00Z').getTime();if(p.timestamp<minT)minT=p.timestamp;if(p.timestamp>maxT)maxT=p.timestamp;p.speed=(typeof p.speed==='string')?parseInt(p.speed.replace(/[^0-9]/g,''),10)||0:p.speed});s.path.sort((a,b)=>a.timestamp-b.timestamp)});
+    }
     if(minT===Infinity){flashError('No valid time data');return}
     startTime=minT;endTime=maxT;currentTime=startTime;
     const tl=document.getElementById('timeline');tl.min=startTime;tl.max=endTime;tl.value=startTime;tl.disabled=false;
@@ -266,10 +275,10 @@ function renderStorm(s) {
     let prog=(currentTime-p1.timestamp)/rng;if(prog>1)prog=1;if(prog<0)prog=0;
     let l1=normalizeLng(p1.long),l2=normalizeLng(p2.long);if(Math.abs(l2-l1)>180){if(l2>l1)l1+=360;else l2+=360}
 
-    const lat=p1.lat+(p2.lat-p1.lat)*prog, lng=l1+(l2-l1)*prog, spd=p1.speedVal+(p2.speedVal-p1.speedVal)*prog, key=getCategoryKey(spd), ll=[lat,normalizeLng(lng)], alive=currentTime<=s.path[s.path.length-1].timestamp;
+    const lat=p1.lat+(p2.lat-p1.lat)*prog, lng=l1+(l2-l1)*prog, spd=p1.speed+(p2.speed-p1.speed)*prog, key=getCategoryKey(spd), ll=[lat,normalizeLng(lng)], alive=currentTime<=s.path[s.path.length-1].timestamp;
 
     if(!stormLayers[s.name]){
-        const nk=getNeededCategories(s), sk=getCategoryKey(p1.speedVal||p1.speed);
+        const nk=getNeededCategories(s), sk=getCategoryKey(p1.speed);
         const marker=L.marker(ll,{icon:getSVGIcon(sk,nk)}).addTo(map);
         injectSVGsIntoMarker(marker, nk);
         marker.bindTooltip(s.name,{permanent:true,direction:'right',className:'storm-label',offset:[8,-20]});
@@ -283,7 +292,7 @@ function renderStorm(s) {
         const mx=alive?idx:s.path.length-2;
         for(let i=l.lastProcessedIdx+1;i<=mx;i++){
             if(i>=s.path.length-1)break;
-            const a=s.path[i],b=s.path[i+1],sp=(typeof a.speed==='string')?parseInt(a.speed.replace(/[^0-9]/g,''),10)||0:a.speed, col=getDiscColor(getCategoryKey(sp));
+            const a=s.path[i],b=s.path[i+1],col=getDiscColor(getCategoryKey(a.speed));
             let al=normalizeLng(a.long),bl=normalizeLng(b.long);if(Math.abs(bl-al)>180){if(bl>al)al+=360;else bl+=360}
             const seg=L.polyline([[a.lat,al],[b.lat,bl]],{color:col,weight:2,opacity:0}).addTo(map);
             l.segments.push(seg); if(!alive&&!l.hasDissipated)fadeInSection(seg);
@@ -314,7 +323,10 @@ function animate(now){if(!isPlaying)return;const dt=now-lastFrameTime;lastFrameT
 window.onload = async () => {
     initMap(); makeDraggable('datePanel'); makeDraggable('controlsPanel','.drag-handle');
     const fi = document.getElementById('fileInput');
-    if(fi) fi.addEventListener('change', e=>{const f=e.target.files[0];if(!f)return;const n=document.getElementById('fileNameDisplay');if(n)n.textContent=f.name;const r=new FileReader();r.onload=ev=>{try{processData(JSON.parse(ev.target.result))}catch(err){flashError('Error Parsing JSON: '+err.message)}};r.readAsText(f)});
+    if(fi) fi.addEventListener('change', e=>{const f=e.target.files[0];if(!f)return;const n=document.getElementById('fileNameDisplay');if(n)n.textContent=f.name;
+        // .json.gz caches from the scraper are gunzipped in the browser before parsing
+        if(f.name.endsWith('.gz')){new Response(f.stream().pipeThrough(new DecompressionStream('gzip'))).text().then(t=>processData(JSON.parse(t))).catch(err=>flashError('Error Parsing JSON: '+err.message));return}
+        const r=new FileReader();r.onload=ev=>{try{processData(JSON.parse(ev.target.result))}catch(err){flashError('Error Parsing JSON: '+err.message)}};r.readAsText(f)});
 
     await preloadSVGs();
     startSVGSync();